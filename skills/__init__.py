@@ -0,0 +1,65 @@
+"""Skills for AI: discovery, indexing and loading of ``SKILL.md`` skills."""
+
+from typing import TYPE_CHECKING, Any
+
+from . import instrument
+from .index import SkillIndex, SkillMeta
+from .parser import (
+    FrontmatterError,
+    ParseResult,
+    Section,
+    iter_frontmatter,
+    iter_sections,
+    read_body,
+    read_frontmatter,
+    read_frontmatter_many,
+)
+from .registry import Skill, SkillNotFoundError, SkillRegistry
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .artifacts import Artifact, ArtifactStore
+    from .cache import CacheStats, ResultCache
+    from .orchestration import Invocation
+
+# Execution support pulls in multiprocessing and asyncio; it is imported on
+# first access so that reading metadata stays cheap.
+_LAZY = {
+    "Artifact": "artifacts",
+    "ArtifactStore": "artifacts",
+    "CacheStats": "cache",
+    "ResultCache": "cache",
+    "Invocation": "orchestration",
+}
+
+__all__ = [
+    "Artifact",
+    "ArtifactStore",
+    "CacheStats",
+    "FrontmatterError",
+    "Invocation",
+    "ResultCache",
+    "ParseResult",
+    "Section",
+    "Skill",
+    "SkillIndex",
+    "SkillMeta",
+    "SkillNotFoundError",
+    "SkillRegistry",
+    "instrument",
+    "iter_frontmatter",
+    "iter_sections",
+    "read_body",
+    "read_frontmatter",
+    "read_frontmatter_many",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
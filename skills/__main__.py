@@ -0,0 +1,27 @@
+"""Command line entry point: ``python -m skills <command>``."""
+
+from __future__ import annotations
+
+import sys
+from typing import Optional, Sequence
+
+COMMANDS = {"bench": "run the benchmark suite"}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS:
+        print("usage: skills <command> [args]\n\ncommands:", file=sys.stderr)
+        for name, help_text in COMMANDS.items():
+            print(f"  {name:<10}{help_text}", file=sys.stderr)
+        return 2
+    command, rest = argv[0], argv[1:]
+    if command == "bench":
+        from .bench import main as bench_main
+
+        return bench_main(rest)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
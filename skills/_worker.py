@@ -0,0 +1,159 @@
+"""Worker process main loop for :mod:`skills.executor`.
+
+A worker imports its preload modules once, then serves script invocations
+sent over a pipe until told to stop.  Kept free of package-level imports so
+that starting a worker does not pay for anything it does not need.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import math
+import os
+import resource
+import runpy
+import sys
+import tempfile
+import time
+import traceback
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+def _limit_cpu(seconds: Optional[float]) -> None:
+    """Allow ``seconds`` more CPU time from now (no limit if ``None``).
+
+    ``RLIMIT_CPU`` counts the whole life of the process, so the soft limit is
+    moved forward before every call; the hard limit is left alone so that it
+    can be raised again for the next one.
+    """
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    else:
+        soft = hard
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _preload(modules: Sequence[str]) -> List[str]:
+    missing = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            missing.append(name)
+    return missing
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _forget_modules(before: Set[str], directory: str) -> None:
+    """Drop modules imported since ``before`` from files below ``directory``.
+
+    Workers are shared by every skill with the same dependencies, so a
+    script's own helper modules must not outlive the call: another skill may
+    have a helper of the same name, and an edited helper must be re-read.
+    """
+    prefix = os.path.join(os.path.realpath(directory), "")
+    for name in [name for name in sys.modules if name not in before]:
+        path = getattr(sys.modules[name], "__file__", None)
+        if path and os.path.realpath(path).startswith(prefix):
+            del sys.modules[name]
+
+
+@contextlib.contextmanager
+def _captured_output() -> Iterator[Tuple[IO[bytes], IO[bytes]]]:
+    """Point file descriptors 1 and 2 at temporary files during a call.
+
+    Redirecting the descriptors, not just ``sys.stdout``, also captures what
+    subprocesses and C extensions write.  Python-level output goes through
+    line-buffered streams on the same descriptors, so ordering is kept.
+    """
+    files = (tempfile.TemporaryFile(), tempfile.TemporaryFile())
+    saved = [os.dup(fd) for fd in (1, 2)]
+    streams = []
+    try:
+        for fd, fh in zip((1, 2), files):
+            os.dup2(fh.fileno(), fd)
+            streams.append(open(fd, "w", buffering=1, encoding="utf-8", errors="backslashreplace", closefd=False))
+        with contextlib.redirect_stdout(streams[0]), contextlib.redirect_stderr(streams[1]):
+            yield files
+    finally:
+        for stream in streams:
+            stream.close()
+        for fd, old in zip((1, 2), saved):
+            os.dup2(old, fd)
+            os.close(old)
+
+
+def _read_back(fh: IO[bytes]) -> str:
+    fh.seek(0)
+    text = fh.read().decode("utf-8", "replace")
+    fh.close()
+    return text
+
+
+def _run(request: Dict[str, Any]) -> Dict[str, Any]:
+    saved_argv, saved_path, saved_cwd = sys.argv, list(sys.path), os.getcwd()
+    saved_modules = set(sys.modules)
+    script = request["script"]
+    artifacts = request.get("artifacts") or {}
+    returncode, error = 0, None
+    start = time.perf_counter()
+    try:
+        _limit_cpu(request.get("cpu_time_limit"))
+        sys.argv = [script, *request.get("args", ())]
+        sys.path.insert(0, os.path.dirname(script))
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        with _captured_output() as (stdout, stderr):
+            try:
+                runpy.run_path(script, init_globals={"ARTIFACTS": artifacts}, run_name="__main__")
+            except SystemExit as exc:
+                returncode = _exit_code(exc)
+            except BaseException:
+                returncode = 1
+                error = traceback.format_exc()
+                sys.stderr.write(error)
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.chdir(saved_cwd)
+        _forget_modules(saved_modules, os.path.dirname(script))
+        for artifact in artifacts.values():
+            try:
+                artifact.close()
+            except BufferError:
+                pass  # the script kept a view; the mapping goes with the worker
+    return {
+        "returncode": returncode,
+        "stdout": _read_back(stdout),
+        "stderr": _read_back(stderr),
+        "error": error,
+        "duration": time.perf_counter() - start,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main(conn: Any, preload: Sequence[str], memory_limit: Optional[int]) -> None:
+    """Serve requests on ``conn`` until it is closed or ``None`` is received."""
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    conn.send({"ready": True, "missing": _preload(preload)})
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        conn.send(_run(request))
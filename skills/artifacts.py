@@ -0,0 +1,206 @@
+"""Zero-copy handles for large artifacts passed between skills.
+
+An :class:`Artifact` exposes its bytes as a :class:`memoryview` over either a
+read-only memory map of a file or a block of POSIX shared memory.  Pickling
+an artifact -- for example when it is sent to an executor worker -- only
+transfers its name, so the receiving process maps the same pages instead of
+receiving a copy.
+
+Artifacts are created through an :class:`ArtifactStore`, which owns the
+shared memory blocks and releases them on :meth:`ArtifactStore.close`::
+
+    with ArtifactStore() as store:
+        pdf = store.put_file("report.pdf")          # mmap, no read
+        executor.run("pdf", "extract.py", artifacts={"pdf": pdf})
+
+Inside a script, the artifacts passed to the call are available as the
+``ARTIFACTS`` global.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+__all__ = ["Artifact", "ArtifactStore"]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_FILE = "file"
+_SHM = "shm"
+# Blocks created by stores in this process; the resource tracker must keep
+# their registration so that it can clean them up if the owner dies.
+_created: Set[str] = set()
+
+
+def _attach_shm(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without registering it for cleanup.
+
+    Before Python 3.13 every attach registers the block with the resource
+    tracker, which unlinks it when the attaching process exits -- destroying
+    it for the owner.  Only the creating store may unlink a block, so the
+    registration is withdrawn right after attaching.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    if name not in _created:
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class Artifact:
+    """A read-only (file) or writable (shared memory) buffer with a stable name.
+
+    Use :meth:`view` for direct buffer access and :meth:`iter_chunks` for
+    streaming.  Views must be released before :meth:`close` is called.
+    """
+
+    def __init__(self, kind: str, name: str, size: int, label: str = "") -> None:
+        self.kind = kind
+        self.name = name
+        self.size = size
+        self.label = label or os.path.basename(name)
+        self._mmap: Optional[mmap.mmap] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._view: Optional[memoryview] = None
+
+    def __repr__(self) -> str:
+        return f"Artifact({self.label!r}, kind={self.kind!r}, size={self.size})"
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, str, int, str]]:
+        return Artifact, (self.kind, self.name, self.size, self.label)
+
+    def __enter__(self) -> "Artifact":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def writable(self) -> bool:
+        return self.kind == _SHM
+
+    def view(self) -> memoryview:
+        """Return a memoryview over the whole artifact, mapping it on first use."""
+        if self._view is None:
+            if self.size == 0:
+                self._view = memoryview(b"")
+            elif self.kind == _FILE:
+                with open(self.name, "rb") as fh:
+                    self._mmap = mmap.mmap(fh.fileno(), self.size, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+            else:
+                self._shm = _attach_shm(self.name) if self._shm is None else self._shm
+                self._view = self._shm.buf[: self.size]
+        return self._view
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0) -> Iterator[memoryview]:
+        """Yield consecutive slices of at most ``chunk_size`` bytes, without copying."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        view = self.view()
+        for offset in range(start, self.size, chunk_size):
+            yield view[offset : offset + chunk_size]
+
+    def read(self, size: int = -1, offset: int = 0) -> bytes:
+        """Copy ``size`` bytes starting at ``offset`` (``-1`` reads to the end)."""
+        end = self.size if size < 0 else min(self.size, offset + size)
+        return bytes(self.view()[offset:end])
+
+    def close(self) -> None:
+        """Unmap the artifact in this process.  It can be mapped again later."""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+
+class ArtifactStore:
+    """Creates artifacts and owns the shared memory backing them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._owned: List[Tuple[Artifact, shared_memory.SharedMemory]] = []
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def put_file(self, path: "os.PathLike[str] | str") -> Artifact:
+        """Wrap an existing file.  Nothing is read until the artifact is viewed."""
+        path = os.path.abspath(os.fspath(path))
+        return Artifact(_FILE, path, os.path.getsize(path))
+
+    def create(self, size: int, label: str = "") -> Artifact:
+        """Allocate a writable shared-memory artifact of ``size`` bytes."""
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        artifact = Artifact(_SHM, shm.name, size, label or shm.name)
+        artifact._shm = shm
+        with self._lock:
+            self._owned.append((artifact, shm))
+            _created.add(shm.name)
+        return artifact
+
+    def put_bytes(self, data: Union[bytes, bytearray, memoryview], label: str = "") -> Artifact:
+        """Copy ``data`` into shared memory once, for sharing with workers."""
+        with memoryview(data) as src:
+            src = src.cast("B")
+            artifact = self.create(src.nbytes, label)
+            artifact.view()[:] = src
+        return artifact
+
+    def release(self, artifact: Artifact) -> None:
+        """Close and free one artifact created by this store."""
+        with self._lock:
+            owned = [(a, s) for a, s in self._owned if a is artifact]
+            self._owned = [(a, s) for a, s in self._owned if a is not artifact]
+        artifact.close()
+        for _, shm in owned:
+            shm.close()
+            shm.unlink()
+            _created.discard(shm.name)
+
+    def close(self) -> None:
+        """Free every shared memory block created by this store."""
+        with self._lock:
+            owned, self._owned = self._owned, []
+        for artifact, shm in owned:
+            try:
+                artifact.close()
+            except BufferError:
+                pass  # a view is still exported; the block is unlinked regardless
+            try:
+                shm.close()
+            except BufferError:
+                pass
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+            _created.discard(shm.name)
+
+
+def artifact_map(artifacts: Optional[Mapping[str, Artifact]]) -> Dict[str, Artifact]:
+    """Validate a name-to-artifact mapping passed to a skill call."""
+    if not artifacts:
+        return {}
+    for key, value in artifacts.items():
+        if not isinstance(value, Artifact):
+            raise TypeError(f"artifact {key!r} is {type(value).__name__}, not Artifact")
+    return dict(artifacts)
@@ -0,0 +1,279 @@
+"""Benchmark suite for the skill registry, retrieval and executor.
+
+Run with ``python -m skills bench``.  Everything runs offline: synthetic
+skill libraries of each requested size are generated in a temporary
+directory.  Results are written as JSON so runs from different commits can
+be compared with ``--compare``.
+
+Skills in the benchmarked tree have their frontmatter parse time measured
+one by one; for synthetic libraries only the distribution across all skills
+is reported.  Scripts are executed only if their skill opts in with a
+``bench`` map of script name to argument list::
+
+    ---
+    name: csv-summary
+    description: ...
+    bench:
+      summarize.py: [fixtures/small.csv]
+    ---
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .index import SKILL_FILENAME
+from .parser import read_frontmatter
+from .registry import SkillRegistry
+
+__all__ = ["compare", "run_benchmarks"]
+
+BENCH_VERSION = 1
+DEFAULT_SIZES = (100, 1000, 10000)
+
+_WORDS = (
+    "pdf docx xlsx csv json yaml image chart table text extract convert summarize merge split "
+    "render fetch parse validate translate resize compress archive email calendar invoice report "
+    "slide spreadsheet database query schema api web page scrape search index audio video"
+).split()
+_FIXTURE_SCRIPT = "import sys\nprint(sum(range(int(sys.argv[1]))))\n"
+
+
+def _percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+def _summary(samples: Sequence[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    ms = [s * 1000.0 for s in samples]
+    return {
+        "n": len(ms),
+        "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+        "p50_ms": _percentile(ms, 50),
+        "p99_ms": _percentile(ms, 99),
+    }
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def generate_library(root: str, count: int, seed: int = 0, with_script: bool = False) -> None:
+    """Write ``count`` synthetic skills below ``root``."""
+    rng = random.Random(seed)
+    for i in range(count):
+        directory = os.path.join(root, f"group{i % 32:02d}", f"skill-{i:05d}")
+        os.makedirs(directory, exist_ok=True)
+        description = " ".join(rng.choices(_WORDS, k=12))
+        body = "\n\n".join(f"## Step {n}\n" + " ".join(rng.choices(_WORDS, k=60)) for n in range(5))
+        with open(os.path.join(directory, SKILL_FILENAME), "w", encoding="utf-8") as fh:
+            fh.write(f"---\nname: skill-{i:05d}\ndescription: {description}\n")
+            if with_script and i == 0:
+                fh.write("bench:\n  loop.py: ['10000']\n")
+            fh.write(f"---\n# Skill {i}\n\n{body}\n")
+        if with_script and i == 0:
+            os.makedirs(os.path.join(directory, "scripts"), exist_ok=True)
+            with open(os.path.join(directory, "scripts", "loop.py"), "w", encoding="utf-8") as fh:
+                fh.write(_FIXTURE_SCRIPT)
+
+
+def bench_library(root: str, repeat: int, per_skill: bool = True) -> Dict[str, Any]:
+    """Index build/load and frontmatter parse times for ``root``.
+
+    With ``per_skill`` every skill's parse is timed ``repeat`` times and
+    reported under its name; otherwise each file is parsed once and
+    ``parse`` summarises those samples across the library.
+    """
+    index_path = os.path.join(tempfile.mkdtemp(prefix="skills-bench-"), "index.json")
+    try:
+        start = time.perf_counter()
+        registry = SkillRegistry(root, index_path=index_path)
+        cold = time.perf_counter() - start
+        warm = _timed(lambda: SkillRegistry(root, index_path=index_path), repeat)
+        parse: Dict[str, Any] = {}
+        samples: List[float] = []
+        for meta in registry:
+            skill_file = os.path.join(registry.root, *meta.path.split("/"), SKILL_FILENAME)
+            if per_skill:
+                parse[meta.name] = _summary(_timed(lambda: read_frontmatter(skill_file), repeat))
+            else:
+                samples.extend(_timed(lambda: read_frontmatter(skill_file), 1))
+        if not per_skill:
+            parse = _summary(samples)
+    finally:
+        shutil.rmtree(os.path.dirname(index_path), ignore_errors=True)
+    return {
+        "skills": len(registry),
+        "index_build_ms": cold * 1000.0,
+        "index_load": _summary(warm),
+        "parse": parse,
+    }
+
+
+def bench_retrieval(registry: SkillRegistry, queries: int) -> Dict[str, Any]:
+    try:
+        retriever = registry.retriever
+    except ImportError as exc:
+        return {"skipped": str(exc)}
+    rng = random.Random(1)
+    texts = [" ".join(rng.choices(_WORDS, k=rng.randint(2, 8))) for _ in range(queries)]
+    retriever.search(texts[0], 5)  # first call pays for the length-norm vector
+    samples = []
+    for text in texts:
+        start = time.perf_counter()
+        retriever.search(text, 5)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def bench_scripts(registry: SkillRegistry, repeat: int) -> Dict[str, Any]:
+    """p50/p99 latency and peak RSS of every script that declares bench args."""
+    from .executor import SkillExecutor
+
+    results: Dict[str, Any] = {}
+    with SkillExecutor(registry, max_workers=1) as executor:
+        for meta in registry:
+            bench = meta.metadata.get("bench")
+            if not isinstance(bench, dict):
+                continue
+            for script, args in bench.items():
+                args = [str(a) for a in (args or [])]
+                start = time.perf_counter()
+                first = executor.run(meta.name, script, args)
+                first_call = time.perf_counter() - start
+                samples, peak, failures = [], first.peak_rss_kb, 0 if first.ok else 1
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    res = executor.run(meta.name, script, args)
+                    samples.append(time.perf_counter() - start)
+                    peak = max(peak, res.peak_rss_kb)
+                    failures += not res.ok
+                results[f"{meta.name}/{script}"] = {
+                    **_summary(samples),
+                    "first_call_ms": first_call * 1000.0,
+                    "peak_rss_kb": peak,
+                    "failures": failures,
+                }
+    return results
+
+
+def _git_commit(path: str) -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True, timeout=5, check=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(
+    root: Optional[str] = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = 20,
+    queries: int = 200,
+    scripts: bool = True,
+) -> Dict[str, Any]:
+    """Run the whole suite and return the JSON-serialisable report."""
+    report: Dict[str, Any] = {
+        "version": BENCH_VERSION,
+        "timestamp": time.time(),
+        "commit": _git_commit(root or os.getcwd()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repo": None,
+        "synthetic": {},
+    }
+    if root is not None:
+        registry = SkillRegistry(root, persist=False)
+        report["repo"] = {
+            **bench_library(root, repeat),
+            "retrieval": bench_retrieval(registry, queries),
+            "scripts": bench_scripts(registry, repeat) if scripts else {},
+        }
+    for size in sizes:
+        tmp = tempfile.mkdtemp(prefix=f"skills-bench-{size}-")
+        try:
+            generate_library(tmp, size, with_script=scripts)
+            library = bench_library(tmp, repeat, per_skill=False)
+            registry = SkillRegistry(tmp, persist=False)
+            library["retrieval"] = bench_retrieval(registry, queries)
+            if scripts and size == min(sizes):
+                library["scripts"] = bench_scripts(registry, repeat)
+            report["synthetic"][str(size)] = library
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return report
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix[:-1]] = float(data)
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2) -> List[str]:
+    """Return descriptions of ``_ms``/``_kb`` metrics that grew by more than ``threshold``."""
+    before = _flatten({"repo": baseline.get("repo"), "synthetic": baseline.get("synthetic")})
+    after = _flatten({"repo": current.get("repo"), "synthetic": current.get("synthetic")})
+    regressions = []
+    for key, old in sorted(before.items()):
+        if not key.endswith(("_ms", "_kb")) or key not in after or old <= 0:
+            continue
+        change = (after[key] - old) / old
+        if change > threshold:
+            regressions.append(f"{key}: {old:.3f} -> {after[key]:.3f} (+{change:.0%})")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="skills bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("root", nargs="?", help="skill tree to benchmark (default: synthetic libraries only)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="synthetic library sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per timing")
+    parser.add_argument("--queries", type=int, default=200, help="retrieval queries per library")
+    parser.add_argument("--no-scripts", action="store_true", help="skip script execution")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="report regressions against a previous report")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run_benchmarks(args.root, sizes, args.repeat, args.queries, not args.no_scripts)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            regressions = compare(json.load(fh), report, args.threshold)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
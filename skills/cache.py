@@ -0,0 +1,344 @@
+"""Content-addressed cache of skill script results.
+
+A result is keyed on everything that determines it: the digest of the
+skill's ``SKILL.md``, the digests of the script and of every other file under
+the skill's ``scripts/`` (which the script may import), the arguments, the
+working directory and the digest of every argument that names an existing
+file.  Editing a skill, one of its scripts or an input file therefore changes
+the key, and stale entries simply age out.
+
+Results are kept in a bounded in-memory LRU and, optionally, in a directory
+on disk shared across processes and sessions.  The disk tier is bounded by
+total size (least recently used entries are evicted first) and entries of
+both tiers expire after ``ttl`` seconds.
+
+Only skills that opt in are cached::
+
+    ---
+    name: docx-to-text
+    description: ...
+    cacheable: true
+    ---
+
+``deterministic: false`` disables caching even if ``cacheable`` is set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+from . import instrument
+from .index import SkillMeta, file_digest
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .executor import ExecutionResult
+
+__all__ = ["CacheStats", "ResultCache", "is_cacheable"]
+
+CACHE_VERSION = 2
+MAX_DIGESTS = 4096
+"""Number of file digests memoised by a cache instance."""
+
+
+def is_cacheable(meta: SkillMeta) -> bool:
+    """Whether ``meta`` declares its script results cacheable."""
+    return meta.metadata.get("cacheable") is True and meta.metadata.get("deterministic") is not False
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hits": self.hits, "hit_rate": self.hit_rate}
+
+
+class ResultCache:
+    """Two-tier (memory, then disk) cache of :class:`ExecutionResult` objects.
+
+    ``directory=None`` disables the disk tier.  ``max_disk_bytes`` bounds the
+    disk tier; ``max_entries`` bounds the memory tier.  ``ttl`` is in seconds;
+    ``None`` means entries never expire.
+    """
+
+    def __init__(
+        self,
+        directory: "Optional[os.PathLike[str] | str]" = None,
+        max_entries: int = 1024,
+        max_disk_bytes: int = 256 << 20,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.directory = os.path.expanduser(os.fspath(directory)) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._digests: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    # -- keys ----------------------------------------------------------------
+
+    def _digest(self, path: str) -> str:
+        """SHA-256 of ``path``, memoised on ``(mtime_ns, size)``."""
+        st = os.stat(path)
+        with self._lock:
+            cached = self._digests.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                self._digests.move_to_end(path)
+                return cached[2]
+        digest = file_digest(path)
+        with self._lock:
+            self._digests[path] = (st.st_mtime_ns, st.st_size, digest)
+            self._digests.move_to_end(path)
+            while len(self._digests) > MAX_DIGESTS:
+                self._digests.popitem(last=False)
+        return digest
+
+    def make_key(
+        self,
+        meta: SkillMeta,
+        script_path: str,
+        args: Sequence[str],
+        cwd: Optional[str] = None,
+        scripts: Iterable[str] = (),
+    ) -> str:
+        """Return the cache key of running ``script_path`` of ``meta`` with ``args``.
+
+        ``scripts`` are the skill's other bundled files, e.g.
+        ``Skill.scripts.values()``; their contents are part of the key.
+        """
+        base = os.path.abspath(cwd) if cwd else None
+        files = []
+        for arg in args:
+            path = os.path.join(base, arg) if base else arg
+            if os.path.isfile(path):
+                files.append(self._digest(path))
+            else:
+                files.append(None)
+        bundled = []
+        for path in scripts:
+            try:
+                bundled.append(self._digest(path))
+            except OSError:
+                pass  # removed since the skill was loaded
+        material = {
+            "v": CACHE_VERSION,
+            "skill": meta.digest,
+            "script": self._digest(script_path),
+            "scripts": sorted(bundled),
+            "args": list(args),
+            "cwd": base,
+            "files": files,
+        }
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    # -- lookup --------------------------------------------------------------
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> "Optional[ExecutionResult]":
+        """Return the cached result for ``key``, or ``None`` on a miss."""
+        with instrument.span("cache.lookup") as span:
+            result, tier = self._get(key)
+            span.set("tier", tier)
+        if result is None:
+            instrument.count("cache.miss")
+        else:
+            instrument.count("cache.hit", tier=tier)
+        return result
+
+    def _get(self, key: str) -> "Tuple[Optional[ExecutionResult], str]":
+        from .executor import ExecutionResult
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._expired(entry[0]):
+                    del self._memory[key]
+                    self._untag(key, entry[1])
+                    self.stats.expirations += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return ExecutionResult(**entry[1]), "memory"
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+                return None, "miss"
+            self.stats.disk_hits += 1
+            self._remember(key, entry)
+        return ExecutionResult(**entry[1]), "disk"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        stored_at = data.get("stored_at", 0.0)
+        if self._expired(stored_at):
+            self._unlink(path)
+            with self._lock:
+                self.stats.expirations += 1
+            return None
+        try:
+            os.utime(path)  # recency for LRU eviction
+        except OSError:
+            pass
+        return stored_at, data["result"]
+
+    def _remember(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        tag = entry[1].get("skill")
+        if tag:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._memory) > self.max_entries:
+            evicted, (_, record) = self._memory.popitem(last=False)
+            self._untag(evicted, record)
+            self.stats.evictions += 1
+
+    def _untag(self, key: str, record: Dict[str, Any]) -> None:
+        keys = self._tags.get(record.get("skill", ""))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[record["skill"]]
+
+    def invalidate(self, skill: str) -> int:
+        """Drop the memory-tier entries of ``skill``; returns how many.
+
+        Entries of an edited skill can never be hit again, since the key
+        covers the skill's content; this frees their memory right away.
+        Their disk-tier files age out through the size bound and TTL.
+        """
+        with self._lock:
+            keys = self._tags.pop(skill, set())
+            for key in keys:
+                self._memory.pop(key, None)
+            return len(keys)
+
+    # -- store ---------------------------------------------------------------
+
+    def put(self, key: str, result: "ExecutionResult") -> None:
+        """Store ``result`` under ``key`` in both tiers."""
+        record = asdict(result)
+        record["cached"] = False
+        entry = (time.time(), record)
+        with self._lock:
+            self._remember(key, entry)
+            self.stats.stores += 1
+        if self.directory is not None:
+            self._write_disk(key, entry)
+
+    def _write_disk(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        path = self._path(key)
+        data = json.dumps({"stored_at": entry[0], "result": entry[1]}, separators=(",", ":")).encode()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data) - replaced
+            over = self._disk_usage() > self.max_disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _disk_usage(self) -> int:
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        return self._disk_bytes
+
+    def _disk_entries(self) -> Iterator[Tuple[str, int, float]]:
+        assert self.directory is not None
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, st.st_size, st.st_mtime
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files until under 90% of the size bound."""
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        evicted = 0
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            if self._unlink(path):
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.stats.evictions += evicted
+
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._tags.clear()
+        if self.directory is not None:
+            for path, _, _ in list(self._disk_entries()):
+                self._unlink(path)
+            with self._lock:
+                self._disk_bytes = 0
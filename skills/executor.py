@@ -0,0 +1,461 @@
+"""Run skill scripts in a pool of warm Python worker processes.
+
+Starting an interpreter and importing heavy libraries dominates the cost of
+short skill scripts.  :class:`SkillExecutor` keeps long-lived workers that
+have already imported a skill's declared dependencies and reuses them across
+calls.  Workers are pooled by dependency set, so skills that need the same
+libraries share workers.
+
+Dependencies are declared in the skill frontmatter as *import* names, which
+are not always the distribution names (``PIL`` for Pillow, ``bs4`` for
+beautifulsoup4)::
+
+    ---
+    name: pdf
+    description: ...
+    dependencies: [pypdf, pdfplumber]
+    ---
+
+Modules that fail to import are logged and listed on each result's
+``missing_dependencies``.
+
+Each call gets a timeout and a CPU-time budget; a worker that exceeds either
+is killed and replaced.  Workers can also be given an address-space limit,
+which applies to the worker as a whole rather than to a single call.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence
+
+from . import _worker, instrument
+from .artifacts import Artifact, artifact_map
+from .registry import SkillRegistry
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import ResultCache
+
+__all__ = ["ExecutionResult", "SkillExecutor", "dependency_key"]
+
+logger = logging.getLogger(__name__)
+
+
+def dependency_key(dependencies: Any) -> FrozenSet[str]:
+    """Normalise a frontmatter ``dependencies`` value (import names) into a pool key."""
+    if not dependencies:
+        return frozenset()
+    if isinstance(dependencies, str):
+        dependencies = dependencies.replace(",", " ").split()
+    return frozenset(filter(None, (str(d).strip() for d in dependencies)))
+
+
+@dataclass
+class ExecutionResult:
+    """Structured outcome of one script invocation."""
+
+    skill: str
+    script: str
+    args: List[str] = field(default_factory=list)
+    returncode: Optional[int] = None
+    """Exit status; ``None`` if the script timed out or the worker died."""
+    stdout: str = ""
+    stderr: str = ""
+    error: Optional[str] = None
+    """Traceback of an uncaught exception, or a description of a worker failure."""
+    duration: float = 0.0
+    """Wall-clock time of the script itself, excluding worker acquisition."""
+    timed_out: bool = False
+    peak_rss_kb: int = 0
+    """Peak resident set size of the worker process so far, in KiB."""
+    worker_pid: Optional[int] = None
+    missing_dependencies: List[str] = field(default_factory=list)
+    """Declared dependencies the worker failed to import."""
+    cached: bool = False
+    """True if the result was served from a :class:`~skills.cache.ResultCache`."""
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+class _Worker:
+    def __init__(self, ctx: Any, key: FrozenSet[str], memory_limit: Optional[int]):
+        self.key = key
+        self.calls = 0
+        self.last_used = time.monotonic()
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker.main,
+            args=(child, sorted(key), memory_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self.missing: List[str] = []
+        self.ready = False
+
+    def wait_ready(self, timeout: Optional[float]) -> None:
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            raise TimeoutError("worker did not start in time")
+        self.missing = self.conn.recv()["missing"]
+        self.ready = True
+        if self.missing:
+            logger.warning("skill worker could not import %s; running without them", ", ".join(self.missing))
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1.0)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        self.kill()
+
+    def exit_reason(self) -> str:
+        code = self.process.exitcode
+        if code == -signal.SIGXCPU:
+            return "CPU time limit exceeded"
+        return f"worker exited with status {code}"
+
+
+class SkillExecutor:
+    """Pool of warm worker processes running skill scripts.
+
+    ``max_workers`` bounds the number of workers per dependency set and
+    ``max_total_workers`` the number across all sets; when the total is
+    reached, the least recently used idle worker of another set is stopped
+    to make room, and callers wait if there is none.  Idle workers are
+    stopped after ``idle_timeout`` seconds, and every worker is recycled
+    after ``max_calls_per_worker`` calls to bound state leaking between
+    scripts.
+
+    ``cpu_time_limit`` (seconds) applies to each call.  ``memory_limit``
+    (bytes) is an address-space limit on the worker process as a whole,
+    including the preloaded modules.  With a ``cache`` (by default the
+    registry's), successful runs of skills declared ``cacheable`` are stored
+    and replayed.
+    """
+
+    def __init__(
+        self,
+        registry: SkillRegistry,
+        max_workers: int = 2,
+        timeout: Optional[float] = 60.0,
+        memory_limit: Optional[int] = None,
+        cpu_time_limit: Optional[float] = None,
+        max_calls_per_worker: int = 100,
+        start_method: Optional[str] = None,
+        cache: "Optional[ResultCache]" = None,
+        max_total_workers: Optional[int] = None,
+        idle_timeout: Optional[float] = 300.0,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_total_workers is not None and max_total_workers < 1:
+            raise ValueError("max_total_workers must be at least 1")
+        self.registry = registry
+        self.max_workers = max_workers
+        self.max_total_workers = max_total_workers
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.cpu_time_limit = cpu_time_limit
+        self.max_calls_per_worker = max_calls_per_worker
+        self.cache = cache if cache is not None else registry.cache
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        self._ctx = multiprocessing.get_context(start_method)
+        self._cond = threading.Condition()
+        self._idle: Dict[FrozenSet[str], List[_Worker]] = {}
+        self._counts: Dict[FrozenSet[str], int] = {}
+        self._closed = False
+        self._reaper: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SkillExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def worker_count(self) -> int:
+        """Number of live workers, busy or idle."""
+        with self._cond:
+            return sum(self._counts.values())
+
+    def key_for(self, skill: str) -> FrozenSet[str]:
+        """Return the dependency set whose workers run ``skill``'s scripts."""
+        return dependency_key(self.registry.get(skill).metadata.get("dependencies"))
+
+    def warm(self, dependencies: Iterable[str] = (), count: int = 1) -> None:
+        """Start up to ``count`` idle workers preloading ``dependencies``."""
+        key = dependency_key(list(dependencies))
+        with self._cond:
+            reserved = 0
+            while reserved < count and self._counts.get(key, 0) < self.max_workers and self._has_room():
+                self._counts[key] = self._counts.get(key, 0) + 1
+                reserved += 1
+        # Processes are started outside the lock; slots whose start fails
+        # are given back.
+        for started in range(reserved):
+            try:
+                worker = self._spawn(key)
+            except BaseException:
+                for _ in range(reserved - started):
+                    self._discard(key)
+                raise
+            self._release(worker)
+
+    def _spawn(self, key: FrozenSet[str]) -> _Worker:
+        instrument.count("executor.spawn")
+        return _Worker(self._ctx, key, self.memory_limit)
+
+    def _has_room(self) -> bool:
+        return self.max_total_workers is None or sum(self._counts.values()) < self.max_total_workers
+
+    def _take_idle(self, expired_only: bool) -> List[_Worker]:
+        """Remove idle workers from the pool (called with the lock held).
+
+        With ``expired_only``, takes every worker idle for longer than
+        ``idle_timeout``; otherwise takes the least recently used one.
+        """
+        now = time.monotonic()
+        taken: List[_Worker] = []
+        candidates = [w for workers in self._idle.values() for w in workers]
+        if expired_only:
+            if self.idle_timeout is None:
+                return taken
+            taken = [w for w in candidates if now - w.last_used > self.idle_timeout]
+        elif candidates:
+            taken = [min(candidates, key=lambda w: w.last_used)]
+        for worker in taken:
+            self._idle[worker.key].remove(worker)
+            self._counts[worker.key] -= 1
+        return taken
+
+    def _acquire(self, key: FrozenSet[str], deadline: Optional[float] = None) -> _Worker:
+        """Take an idle worker of ``key`` or reserve a slot and start one.
+
+        Waits for a slot until ``deadline`` (a :func:`time.monotonic` value),
+        then raises :class:`TimeoutError`.
+        """
+        retired: List[_Worker] = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("executor is closed")
+                    retired += self._take_idle(expired_only=True)
+                    idle = self._idle.get(key)
+                    while idle:
+                        worker = idle.pop()
+                        if worker.alive:
+                            return worker
+                        self._counts[key] -= 1
+                        retired.append(worker)
+                    if self._counts.get(key, 0) < self.max_workers:
+                        if not self._has_room():
+                            retired += self._take_idle(expired_only=False)
+                        if self._has_room():
+                            self._counts[key] = self._counts.get(key, 0) + 1
+                            break
+                    wait = self.idle_timeout
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError("no worker became available in time")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+        finally:
+            for worker in retired:
+                worker.stop()
+        try:
+            return self._spawn(key)
+        except BaseException:
+            self._discard(key)
+            raise
+
+    def _release(self, worker: _Worker) -> None:
+        worker.last_used = time.monotonic()
+        with self._cond:
+            if not self._closed and worker.alive and worker.calls < self.max_calls_per_worker:
+                self._idle.setdefault(worker.key, []).append(worker)
+                expired = self._take_idle(expired_only=True)
+                self._cond.notify_all()
+                if self.idle_timeout is not None and (self._reaper is None or not self._reaper.is_alive()):
+                    self._reaper = threading.Thread(target=self._reap, name="skills-reaper", daemon=True)
+                    self._reaper.start()
+            else:
+                expired = None
+        if expired is None:
+            self._retire(worker)
+            return
+        for old in expired:
+            old.stop()
+
+    def _reap(self) -> None:
+        """Stop workers idle for longer than ``idle_timeout``; exits once none are idle."""
+        assert self.idle_timeout is not None
+        while True:
+            with self._cond:
+                if self._closed or not any(self._idle.values()):
+                    self._reaper = None
+                    return
+                oldest = min(w.last_used for workers in self._idle.values() for w in workers)
+                delay = oldest + self.idle_timeout - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay + 0.01)
+                expired = self._take_idle(expired_only=True)
+                if expired:
+                    self._cond.notify_all()
+            for worker in expired:
+                worker.stop()
+
+    def _retire(self, worker: _Worker) -> None:
+        worker.stop()
+        self._discard(worker.key)
+
+    def _discard(self, key: FrozenSet[str]) -> None:
+        with self._cond:
+            self._counts[key] -= 1
+            self._cond.notify_all()
+
+    def run(
+        self,
+        skill: str,
+        script: str,
+        args: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        cwd: "Optional[os.PathLike[str] | str]" = None,
+        artifacts: "Optional[Mapping[str, Artifact]]" = None,
+    ) -> ExecutionResult:
+        """Run ``script`` of ``skill`` with ``args`` in a warm worker.
+
+        ``timeout`` defaults to the executor's timeout and covers waiting
+        for a worker and its start-up as well as the script; the CPU-time
+        budget is the executor's ``cpu_time_limit``.  ``artifacts`` are
+        shared with the worker by name, not copied, and appear as the
+        ``ARTIFACTS`` global of the script; calls with artifacts bypass the
+        result cache.  Script failures are reported on the result; only
+        unknown skills or scripts raise.
+        """
+        loaded = self.registry.load(skill)
+        path = loaded.script_path(script)
+        args = [str(a) for a in args]
+        cwd = os.fspath(cwd) if cwd else None
+        shared = artifact_map(artifacts)
+        cache_key = None
+        if self.cache is not None and not shared:
+            from .cache import is_cacheable
+
+            if is_cacheable(loaded.meta):
+                cache_key = self.cache.make_key(loaded.meta, path, args, cwd, loaded.scripts.values())
+                hit = self.cache.get(cache_key)
+                if hit is not None:
+                    hit.cached = True
+                    return hit
+        result = self._execute(skill, script, path, args, timeout, cwd, shared)
+        if cache_key is not None and result.ok:
+            self.cache.put(cache_key, result)
+        return result
+
+    def _execute(
+        self,
+        skill: str,
+        script: str,
+        path: str,
+        args: List[str],
+        timeout: Optional[float],
+        cwd: Optional[str],
+        artifacts: Dict[str, Artifact],
+    ) -> ExecutionResult:
+        timeout = self.timeout if timeout is None else timeout
+        result = ExecutionResult(skill, script, args)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with instrument.span("executor.acquire", skill=skill) as span:
+            try:
+                worker = self._acquire(self.key_for(skill), deadline)
+            except TimeoutError as exc:
+                result.timed_out = True
+                result.error = str(exc)
+                instrument.count("executor.timeout", skill=skill)
+                return result
+            span.set("spawned", not worker.ready)
+            result.worker_pid = worker.process.pid
+            try:
+                worker.wait_ready(None if deadline is None else max(0.0, deadline - time.monotonic()))
+                result.missing_dependencies = list(worker.missing)
+            except TimeoutError as exc:
+                result.timed_out = True
+                result.error = str(exc)
+                worker.kill()
+                self._release(worker)
+                instrument.count("executor.timeout", skill=skill)
+                return result
+            except (EOFError, OSError):
+                worker.kill()
+                self._release(worker)
+                result.error = worker.exit_reason()
+                return result
+        try:
+            with instrument.span("executor.script", skill=skill, script=script):
+                worker.calls += 1
+                worker.conn.send(
+                    {
+                        "script": path,
+                        "args": args,
+                        "cwd": cwd,
+                        "artifacts": artifacts,
+                        "cpu_time_limit": self.cpu_time_limit,
+                    }
+                )
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not worker.conn.poll(remaining):
+                    result.timed_out = True
+                    result.error = f"timed out after {timeout}s"
+                    worker.kill()
+                    instrument.count("executor.timeout", skill=skill)
+                    return result
+                reply = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.kill()
+            result.error = worker.exit_reason()
+            return result
+        finally:
+            self._release(worker)
+        result.returncode = reply["returncode"]
+        result.stdout = reply["stdout"]
+        result.stderr = reply["stderr"]
+        result.error = reply["error"]
+        result.duration = reply["duration"]
+        result.peak_rss_kb = reply["peak_rss_kb"]
+        return result
+
+    def close(self) -> None:
+        """Stop all idle workers; busy workers are stopped when released."""
+        with self._cond:
+            self._closed = True
+            idle = [w for workers in self._idle.values() for w in workers]
+            self._idle.clear()
+            self._cond.notify_all()
+        for worker in idle:
+            self._retire(worker)
@@ -0,0 +1,338 @@
+"""Persistent on-disk index of skill metadata.
+
+The index is a single JSON file holding, for every skill, the fields needed to
+list and select skills (name, description, path) together with the ``stat``
+signature and content digest of its ``SKILL.md``.  Loading the index is one
+file read; only entries whose signature changed are re-hashed, and only
+entries whose digest changed are re-parsed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import instrument
+from .parser import FrontmatterError, read_frontmatter
+
+__all__ = ["INDEX_FILENAME", "SKILL_FILENAME", "SkillMeta", "SkillIndex", "discover", "file_digest"]
+
+SKILL_FILENAME = "SKILL.md"
+INDEX_FILENAME = ".skills-index.json"
+INDEX_VERSION = 1
+
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules"})
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SkillMeta:
+    """Metadata of a single skill, as stored in the index."""
+
+    name: str
+    description: str
+    path: str
+    """Path of the skill directory, relative to the registry root (POSIX form)."""
+    mtime_ns: int = 0
+    size: int = 0
+    digest: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    """Remaining frontmatter keys, excluding ``name`` and ``description``."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SkillMeta":
+        return cls(**data)
+
+    @classmethod
+    def from_file(cls, root: str, skill_file: str, st: Optional[os.stat_result] = None) -> "SkillMeta":
+        """Parse the frontmatter of ``skill_file`` into a new entry."""
+        st = st or os.stat(skill_file)
+        front = dict(read_frontmatter(skill_file))
+        skill_dir = os.path.dirname(skill_file)
+        name = str(front.pop("name", "") or os.path.basename(skill_dir))
+        description = str(front.pop("description", "") or "")
+        return cls(
+            name=name,
+            description=description.strip(),
+            path=os.path.relpath(skill_dir, root).replace(os.sep, "/"),
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            digest=file_digest(skill_file),
+            metadata=_jsonable(front),
+        )
+
+
+def _jsonable(value: Any) -> Any:
+    """Coerce YAML scalars (dates, etc.) into values JSON can store."""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of the file at ``path``."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def discover(root: str) -> Iterator[str]:
+    """Yield the paths of all ``SKILL.md`` files below ``root``.
+
+    A directory containing ``SKILL.md`` is a skill; its subdirectories are not
+    searched further.  Hidden directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        subdirs = []
+        found = None
+        for entry in entries:
+            if entry.name == SKILL_FILENAME and entry.is_file():
+                found = entry.path
+                break
+            if (
+                entry.is_dir(follow_symlinks=False)
+                and not entry.name.startswith(".")
+                and entry.name not in _SKIP_DIRS
+            ):
+                subdirs.append(entry.path)
+        if found is not None:
+            yield found
+        else:
+            stack.extend(sorted(subdirs, reverse=True))
+
+
+class SkillIndex:
+    """In-memory view of the index file, keyed by skill name.
+
+    Entries are stored per skill directory.  When several directories declare
+    the same name, the one whose path sorts first is visible under that name
+    and the collision is logged; the others are kept and take over if it goes
+    away.
+    """
+
+    def __init__(self, root: str, entries: Iterable[SkillMeta] = ()) -> None:
+        self.root = os.path.abspath(root)
+        self._by_path: Dict[str, SkillMeta] = {}
+        self._paths: Dict[str, Tuple[str, ...]] = {}
+        self._entries: Dict[str, SkillMeta] = {}
+        for meta in entries:
+            self._add(meta)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[SkillMeta]:
+        return iter(self._entries.values())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def get(self, name: str) -> Optional[SkillMeta]:
+        return self._entries.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def paths(self) -> List[str]:
+        """Directories of all indexed skills, including ones shadowed by a name collision."""
+        return list(self._by_path)
+
+    def _add(self, meta: SkillMeta) -> None:
+        """Insert or replace the entry for ``meta.path``."""
+        self._discard(meta.path)
+        self._by_path[meta.path] = meta
+        paths = self._paths[meta.name] = (*self._paths.get(meta.name, ()), meta.path)
+        self._elect(meta.name)
+        if len(paths) > 1:
+            logger.warning(
+                "skill name %r is declared by %s; using %r",
+                meta.name,
+                ", ".join(sorted(paths)),
+                self._entries[meta.name].path,
+            )
+
+    def _discard(self, path: str) -> Optional[SkillMeta]:
+        """Remove the entry for ``path``; returns it, or None if absent."""
+        meta = self._by_path.pop(path, None)
+        if meta is None:
+            return None
+        paths = tuple(p for p in self._paths[meta.name] if p != path)
+        if paths:
+            self._paths[meta.name] = paths
+            self._elect(meta.name)
+        else:
+            del self._paths[meta.name]
+            del self._entries[meta.name]
+        return meta
+
+    def _elect(self, name: str) -> None:
+        winner = min(self._paths[name], key=lambda p: p.split("/"))
+        self._entries[name] = self._by_path[winner]
+
+    @classmethod
+    def read(cls, root: str, index_path: str) -> "SkillIndex":
+        """Load the index at ``index_path``; returns an empty index if unusable."""
+        with instrument.span("index.load") as span:
+            index = cls._read(root, index_path)
+            span.set("skills", len(index))
+            return index
+
+    @classmethod
+    def _read(cls, root: str, index_path: str) -> "SkillIndex":
+        try:
+            with open(index_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return cls(root)
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return cls(root)
+        skills = data.get("skills", [])
+        if not isinstance(skills, list):
+            return cls(root)
+        try:
+            entries = [SkillMeta.from_dict(d) for d in skills]
+        except TypeError:
+            return cls(root)
+        return cls(root, entries)
+
+    def write(self, index_path: str) -> None:
+        """Atomically write the index to ``index_path``."""
+        data = {"version": INDEX_VERSION, "skills": [m.to_dict() for m in self._by_path.values()]}
+        directory = os.path.dirname(os.path.abspath(index_path))
+        fd, tmp = tempfile.mkstemp(prefix=".skills-index.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, separators=(",", ":"))
+            os.replace(tmp, index_path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def rebuild(self, max_workers: Optional[int] = None) -> bool:
+        """Revalidate against the skill tree; return True if anything changed.
+
+        Files whose ``(mtime_ns, size)`` match the stored entry are trusted
+        as-is.  The rest are hashed, and only re-parsed when the digest
+        differs from the stored one; that work runs on a thread pool.
+        """
+        with instrument.span("index.rebuild") as span:
+            changed = self._rebuild(max_workers)
+            span.set("changed", changed)
+            return changed
+
+    def _rebuild(self, max_workers: Optional[int]) -> bool:
+        by_path = dict(self._by_path)
+        slots: List[Optional[SkillMeta]] = []
+        pending: List[Tuple[int, str, Optional[SkillMeta]]] = []
+        changed = False
+        for skill_file in discover(self.root):
+            rel = os.path.relpath(os.path.dirname(skill_file), self.root).replace(os.sep, "/")
+            old = by_path.pop(rel, None)
+            try:
+                st = os.stat(skill_file)
+            except OSError:
+                changed = changed or old is not None
+                continue
+            if old is not None and old.mtime_ns == st.st_mtime_ns and old.size == st.st_size:
+                slots.append(old)
+            else:
+                pending.append((len(slots), skill_file, old))
+                slots.append(None)
+        if pending:
+            if len(pending) == 1 or max_workers == 1:
+                results = [self._validate(f, old) for _, f, old in pending]
+            else:
+                workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(lambda job: self._validate(job[1], job[2]), pending))
+            for (slot, _, old), meta in zip(pending, results):
+                slots[slot] = meta
+                changed = changed or meta is not old
+        changed = changed or bool(by_path)
+        if changed:
+            self._by_path, self._paths, self._entries = {}, {}, {}
+            for meta in slots:
+                if meta is not None:
+                    self._add(meta)
+        return changed
+
+    def update_paths(self, paths: Iterable[str]) -> bool:
+        """Revalidate only the skills at or below ``paths``; True on change.
+
+        Each path may be a skill directory, a directory holding several
+        skills, or a path that no longer exists.  Entries below a path that
+        are no longer found are removed; new skills below it are added.
+        """
+        changed = False
+        for path in paths:
+            path = os.path.abspath(path)
+            rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+            if rel == ".." or rel.startswith("../"):
+                continue
+            prefix = "" if rel == "." else rel + "/"
+            stale = {p: m for p, m in self._by_path.items() if not prefix or (p + "/").startswith(prefix)}
+            for skill_file in discover(path):
+                skill_rel = os.path.relpath(os.path.dirname(skill_file), self.root).replace(os.sep, "/")
+                old = stale.pop(skill_rel, None)
+                try:
+                    st = os.stat(skill_file)
+                except OSError:
+                    meta = None
+                else:
+                    if old is not None and old.mtime_ns == st.st_mtime_ns and old.size == st.st_size:
+                        continue
+                    meta = self._validate(skill_file, old)
+                if meta is old:
+                    continue
+                changed = True
+                self._discard(skill_rel)
+                if meta is not None:
+                    self._add(meta)
+            for stale_path in stale:
+                self._discard(stale_path)
+                changed = True
+        return changed
+
+    def copy(self) -> "SkillIndex":
+        """Return a shallow copy; entries are shared, the mapping is not."""
+        new = SkillIndex(self.root)
+        new._by_path = dict(self._by_path)
+        new._paths = dict(self._paths)
+        new._entries = dict(self._entries)
+        return new
+
+    def _validate(self, skill_file: str, old: Optional[SkillMeta]) -> Optional[SkillMeta]:
+        """Return the up-to-date entry for ``skill_file``, or None if unreadable."""
+        try:
+            st = os.stat(skill_file)
+            if old is not None and file_digest(skill_file) == old.digest:
+                # Touched but not modified: refresh the signature, keep the parse.
+                return SkillMeta(**{**old.to_dict(), "mtime_ns": st.st_mtime_ns, "size": st.st_size})
+            return SkillMeta.from_file(self.root, skill_file, st)
+        except (OSError, UnicodeDecodeError, FrontmatterError):
+            return None
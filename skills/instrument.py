@@ -0,0 +1,249 @@
+"""Timing spans and counters on the load/select/execute hot paths.
+
+Instrumentation is off by default: :func:`span` then returns a shared no-op
+object and :func:`count` returns immediately, so the hooks cost one global
+lookup and a call.  Install an exporter at any time to start recording and
+remove it to stop; no restart is needed::
+
+    from skills import instrument
+
+    instrument.enable(instrument.JsonLinesExporter("trace.jsonl"))
+    ...
+    instrument.disable()
+
+Span names used by the package:
+
+``index.load``, ``index.rebuild``
+    Reading the index file; revalidating it against the skill tree.
+``cache.lookup``
+    Result cache lookup (attribute ``tier``: ``memory``, ``disk`` or ``miss``).
+``retrieval.search``
+    BM25 scoring and top-k selection.
+``executor.acquire``
+    Waiting for (or starting) a worker (attribute ``spawned``).
+``executor.script``
+    Script round trip in the worker (attributes ``skill``, ``script``).
+
+Counters: ``cache.hit``, ``cache.miss``, ``executor.spawn``,
+``executor.timeout``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, Optional, Union
+
+__all__ = [
+    "Exporter",
+    "JsonLinesExporter",
+    "OpenTelemetryExporter",
+    "Span",
+    "SpanExporter",
+    "count",
+    "disable",
+    "enable",
+    "enabled",
+    "span",
+]
+
+
+class Span:
+    """A running span; attributes can be added until it ends."""
+
+    __slots__ = ("name", "attrs", "start", "duration", "error", "_exporter", "_t0")
+
+    def __init__(self, exporter: "SpanExporter", name: str, attrs: Dict[str, Any]) -> None:
+        self._exporter = exporter
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        self._t0 = 0.0
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.duration = time.perf_counter() - self._t0
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self._exporter.export_span(self)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Exporter(ABC):
+    """Base class for exporters.
+
+    ``span`` returns the context manager timing one span; ``count`` records
+    a counter increment.
+    """
+
+    @abstractmethod
+    def span(self, name: str, attrs: Dict[str, Any]) -> Any:
+        """Return a context manager with a ``set(key, value)`` method."""
+
+    @abstractmethod
+    def count(self, name: str, value: float, attrs: Dict[str, Any]) -> None:
+        """Record an increment of counter ``name``."""
+
+    def close(self) -> None:
+        pass
+
+
+class SpanExporter(Exporter):
+    """Exporter timing spans itself; subclasses receive each finished :class:`Span`."""
+
+    def span(self, name: str, attrs: Dict[str, Any]) -> Span:
+        return Span(self, name, attrs)
+
+    @abstractmethod
+    def export_span(self, span: Span) -> None:
+        """Record ``span``, which has just ended."""
+
+
+class JsonLinesExporter(SpanExporter):
+    """Append one JSON object per span or counter increment to a file."""
+
+    def __init__(self, target: "Union[str, os.PathLike[str], IO[str]]") -> None:
+        if hasattr(target, "write"):
+            self._fh: IO[str] = target  # type: ignore[assignment]
+            self._owns = False
+        else:
+            self._fh = open(os.fspath(target), "a", encoding="utf-8")  # type: ignore[arg-type]
+            self._owns = True
+        self._lock = threading.Lock()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+
+    def export_span(self, span: Span) -> None:
+        record = {
+            "type": "span",
+            "name": span.name,
+            "start": span.start,
+            "duration_ms": span.duration * 1000.0,
+            "attrs": span.attrs,
+        }
+        if span.error:
+            record["error"] = span.error
+        self._write(record)
+
+    def count(self, name: str, value: float, attrs: Dict[str, Any]) -> None:
+        self._write({"type": "counter", "name": name, "time": time.time(), "value": value, "attrs": attrs})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns:
+                self._fh.close()
+
+
+class OpenTelemetryExporter(Exporter):
+    """Forward spans and counters to the OpenTelemetry API.
+
+    Requires the ``opentelemetry-api`` package; the SDK and exporters are
+    configured by the application as usual.
+    """
+
+    def __init__(self, tracer: Any = None, meter: Any = None, name: str = "skills") -> None:
+        from opentelemetry import metrics, trace
+
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer(name)
+        self._meter = meter or metrics.get_meter(name)
+        self._counters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, attrs: Dict[str, Any]) -> Any:
+        return _OtelSpan(self._tracer.start_as_current_span(name, attributes=attrs))
+
+    def count(self, name: str, value: float, attrs: Dict[str, Any]) -> None:
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.get(name)
+                if counter is None:
+                    counter = self._counters[name] = self._meter.create_counter(name)
+        counter.add(value, attributes=attrs)
+
+
+class _OtelSpan:
+    __slots__ = ("_cm", "_span")
+
+    def __init__(self, cm: Any) -> None:
+        self._cm = cm
+        self._span: Any = None
+
+    def set(self, key: str, value: Any) -> None:
+        if self._span is not None:
+            self._span.set_attribute(key, value)
+
+    def __enter__(self) -> "_OtelSpan":
+        self._span = self._cm.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self._cm.__exit__(exc_type, exc, tb)
+
+
+_exporter: Optional[Exporter] = None
+
+
+def enable(exporter: Exporter) -> Optional[Exporter]:
+    """Install ``exporter``; returns the previously installed one, if any."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def disable() -> Optional[Exporter]:
+    """Remove the current exporter and return it.  Hooks become no-ops."""
+    global _exporter
+    previous, _exporter = _exporter, None
+    return previous
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """Return a context manager timing ``name``; a no-op when disabled."""
+    exporter = _exporter
+    if exporter is None:
+        return _NOOP_SPAN
+    return exporter.span(name, attrs)
+
+
+def count(name: str, value: float = 1, **attrs: Any) -> None:
+    """Increment counter ``name`` by ``value``; a no-op when disabled."""
+    exporter = _exporter
+    if exporter is not None:
+        exporter.count(name, value, attrs)
@@ -0,0 +1,182 @@
+"""Concurrent execution of skill invocations with asyncio.
+
+:func:`invoke_many` runs a batch of :class:`Invocation` objects as soon as
+their dependencies have finished.  Concurrency is bounded globally and per
+named resource (e.g. ``"network"`` or ``"gpu"``), so a large batch queues
+instead of oversubscribing the worker pool.
+
+A skill can declare the resources it uses in its frontmatter::
+
+    ---
+    name: web-fetch
+    description: ...
+    resources: [network]
+    ---
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .artifacts import Artifact
+from .executor import ExecutionResult, SkillExecutor
+
+__all__ = ["Invocation", "invoke_many"]
+
+ArgsFactory = Callable[[Mapping[str, ExecutionResult]], Sequence[str]]
+
+
+@dataclass
+class Invocation:
+    """One script run in a batch.
+
+    ``id`` defaults to the skill name and must be unique within a batch.
+    ``args`` may be a callable, which is called with the results of the
+    invocations listed in ``depends_on`` to build the arguments once they
+    are available.  ``resources`` is added to the skill's declared ones.
+    """
+
+    skill: str
+    script: str
+    args: Union[Sequence[str], ArgsFactory] = ()
+    id: str = ""
+    depends_on: Sequence[str] = ()
+    resources: Sequence[str] = ()
+    timeout: Optional[float] = None
+    cwd: Optional[str] = None
+    artifacts: Optional[Mapping[str, Artifact]] = None
+
+    def __post_init__(self) -> None:
+        if not self.id:
+            self.id = self.skill
+
+
+@dataclass
+class _Node:
+    invocation: Invocation
+    resources: Tuple[str, ...]
+    done: "asyncio.Future[ExecutionResult]"
+
+
+def _check_graph(invocations: Sequence[Invocation]) -> None:
+    ids = [inv.id for inv in invocations]
+    seen = set()
+    for inv_id in ids:
+        if inv_id in seen:
+            raise ValueError(f"duplicate invocation id {inv_id!r}")
+        seen.add(inv_id)
+    deps = {inv.id: list(inv.depends_on) for inv in invocations}
+    for inv_id, needs in deps.items():
+        for dep in needs:
+            if dep not in deps:
+                raise ValueError(f"{inv_id!r} depends on unknown invocation {dep!r}")
+    state: Dict[str, int] = {}
+    for start in ids:
+        if state.get(start):
+            continue
+        stack = [(start, iter(deps[start]))]
+        state[start] = 1
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if state.get(child) == 1:
+                    raise ValueError(f"dependency cycle through {child!r}")
+                if not state.get(child):
+                    state[child] = 1
+                    stack.append((child, iter(deps[child])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+
+
+def _declared_resources(executor: SkillExecutor, inv: Invocation) -> Tuple[str, ...]:
+    declared = executor.registry.get(inv.skill).metadata.get("resources") or ()
+    if isinstance(declared, str):
+        declared = declared.replace(",", " ").split()
+    return tuple(sorted({*map(str, declared), *inv.resources}))
+
+
+async def invoke_many(
+    executor: SkillExecutor,
+    invocations: Iterable[Invocation],
+    max_concurrency: Optional[int] = None,
+    resource_limits: Optional[Mapping[str, int]] = None,
+) -> Dict[str, ExecutionResult]:
+    """Run ``invocations`` concurrently, respecting ``depends_on`` ordering.
+
+    At most ``max_concurrency`` scripts run at once (default: the executor's
+    per-dependency-set worker count times four), and at most
+    ``resource_limits[name]`` at once for each named resource.  An
+    invocation whose dependency did not succeed is not run; its result has
+    ``returncode=None`` and an ``error`` naming the dependency.
+
+    Returns the results keyed by invocation id, in input order.
+    Unknown dependencies and cycles raise :class:`ValueError` before
+    anything runs.
+    """
+    invocations = list(invocations)
+    _check_graph(invocations)
+    if not invocations:
+        return {}
+    loop = asyncio.get_running_loop()
+    limit = max_concurrency or executor.max_workers * 4
+    global_sem = asyncio.Semaphore(limit)
+    resource_sems = {name: asyncio.Semaphore(n) for name, n in (resource_limits or {}).items()}
+    nodes = {
+        inv.id: _Node(inv, _declared_resources(executor, inv), loop.create_future()) for inv in invocations
+    }
+
+    async def run(node: _Node, threads: ThreadPoolExecutor) -> None:
+        inv = node.invocation
+        deps: Dict[str, ExecutionResult] = {}
+        for dep in inv.depends_on:
+            deps[dep] = await asyncio.shield(nodes[dep].done)
+        failed = [dep for dep, res in deps.items() if not res.ok]
+        if failed:
+            args = [] if callable(inv.args) else list(inv.args)
+            result = ExecutionResult(inv.skill, inv.script, args, error=f"dependency {failed[0]!r} failed")
+            node.done.set_result(result)
+            return
+        try:
+            args = list(inv.args(deps)) if callable(inv.args) else list(inv.args)
+            async with contextlib.AsyncExitStack() as stack:
+                # Resources are acquired in sorted order so that two
+                # invocations can never wait on each other's semaphores.
+                for name in node.resources:
+                    if name in resource_sems:
+                        await stack.enter_async_context(resource_sems[name])
+                await stack.enter_async_context(global_sem)
+                result = await loop.run_in_executor(
+                    threads, executor.run, inv.skill, inv.script, args, inv.timeout, inv.cwd, inv.artifacts
+                )
+        except asyncio.CancelledError:
+            node.done.cancel()
+            raise
+        except BaseException as exc:
+            if not node.done.done():
+                node.done.set_exception(exc)
+            raise
+        node.done.set_result(result)
+
+    # Not used as a context manager: its exit waits for running scripts on
+    # the event loop thread, which would block the loop on error or
+    # cancellation.  Scripts already running finish in their threads.
+    threads = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="skills-invoke")
+    tasks: List[asyncio.Task] = [asyncio.ensure_future(run(node, threads)) for node in nodes.values()]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        threads.shutdown(wait=False, cancel_futures=True)
+        # Consume exceptions set on futures nobody awaited.
+        for node in nodes.values():
+            if node.done.done() and not node.done.cancelled():
+                node.done.exception()
+    return {inv_id: node.done.result() for inv_id, node in nodes.items()}
@@ -0,0 +1,278 @@
+"""Parsing of ``SKILL.md`` files.
+
+A skill file starts with a YAML frontmatter block delimited by ``---`` lines,
+followed by the markdown body::
+
+    ---
+    name: pdf
+    description: Extract text and tables from PDF files.
+    ---
+    # PDF
+
+    ...
+
+Reading the frontmatter stops at the closing delimiter, so the body is never
+read unless asked for.  The body can be streamed one section (heading plus
+the text under it) at a time with :func:`iter_sections`, and many files can
+be parsed concurrently with :func:`read_frontmatter_many`.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:  # PyYAML is optional; simple ``key: value`` frontmatter works without it.
+    import yaml
+except ImportError:  # pragma: no cover - depends on the environment
+    yaml = None
+
+__all__ = [
+    "FrontmatterError",
+    "ParseResult",
+    "Section",
+    "iter_frontmatter",
+    "iter_sections",
+    "parse_frontmatter",
+    "read_body",
+    "read_frontmatter",
+    "read_frontmatter_many",
+    "split_frontmatter",
+]
+
+DELIMITER = "---"
+CHUNK_SIZE = 4096
+"""Read size for the frontmatter scan; typical frontmatter fits in one chunk."""
+MAX_FRONTMATTER = 1 << 20
+
+_BOM = b"\xef\xbb\xbf"
+_DELIMITER_BYTES = DELIMITER.encode()
+
+
+class FrontmatterError(ValueError):
+    """Raised when a skill file has a missing or malformed frontmatter block."""
+
+
+@dataclass
+class Section:
+    """A block of the markdown body: a heading and the lines below it.
+
+    The text before the first heading is yielded as a section with
+    ``level == 0`` and an empty ``heading``.
+    """
+
+    heading: str
+    level: int
+    text: str
+
+
+@dataclass
+class ParseResult:
+    """Outcome of parsing one file in :func:`read_frontmatter_many`."""
+
+    path: str
+    frontmatter: Dict[str, Any] = field(default_factory=dict)
+    body_offset: int = 0
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
+
+def parse_frontmatter(text: str, path: str = "<string>") -> Dict[str, Any]:
+    """Parse the YAML text between the frontmatter delimiters into a dict.
+
+    ``path`` is only used in error messages.
+    """
+    if yaml is not None:
+        try:
+            data = yaml.load(text, Loader=_YAML_LOADER)
+        except yaml.YAMLError as exc:
+            raise FrontmatterError(f"{path}: invalid frontmatter: {exc}") from exc
+        if data is None:
+            return {}
+        if not isinstance(data, dict):
+            raise FrontmatterError(f"{path}: frontmatter must be a mapping")
+        return data
+    return _parse_flat(text, path)
+
+
+def _parse_flat(text: str, path: str) -> Dict[str, Any]:
+    """Fallback parser for flat ``key: value`` frontmatter."""
+    data: Dict[str, Any] = {}
+    for lineno, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        key, sep, value = stripped.partition(":")
+        if not sep or not key.strip():
+            raise FrontmatterError(f"{path}: line {lineno}: expected 'key: value'")
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+            value = value[1:-1]
+        elif value.lower() in ("true", "false"):
+            value = value.lower() == "true"
+        data[key.strip()] = value
+    return data
+
+
+class _Scanner:
+    """Incremental search for the frontmatter block in a growing buffer.
+
+    Each :meth:`feed` resumes at the first line not yet examined, so reading
+    a file chunk by chunk scans every byte once.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.buf = bytearray()
+        self.content_start: Optional[int] = None
+        self.pos = 0
+
+    def feed(self, chunk: bytes, final: bool) -> Optional[Tuple[str, int]]:
+        """Add ``chunk``; return the frontmatter text and body offset once found.
+
+        Returns ``None`` when more data is needed; ``final`` says that no more
+        data will follow.
+        """
+        data = self.buf
+        data += chunk
+        if self.content_start is None:
+            start = len(_BOM) if data.startswith(_BOM) else 0
+            eol = data.find(b"\n", start)
+            if eol < 0 and not final:
+                return None
+            first = data[start:] if eol < 0 else data[start:eol]
+            if first.rstrip(b"\r") != _DELIMITER_BYTES:
+                raise FrontmatterError(f"{self.path}: missing opening '{DELIMITER}'")
+            self.content_start = self.pos = len(data) if eol < 0 else eol + 1
+        while self.pos < len(data):
+            eol = data.find(b"\n", self.pos)
+            if eol < 0 and not final:
+                return None
+            end = len(data) if eol < 0 else eol
+            if data[self.pos : end].rstrip(b"\r") == _DELIMITER_BYTES:
+                text = bytes(data[self.content_start : self.pos]).decode("utf-8")
+                return text, end + 1 if eol >= 0 else end
+            self.pos = end + 1
+        if final:
+            raise FrontmatterError(f"{self.path}: missing closing '{DELIMITER}'")
+        return None
+
+
+def split_frontmatter(data: bytes, path: str = "<bytes>") -> Tuple[str, int]:
+    """Split the frontmatter off ``data``; returns its text and the body offset."""
+    found = _Scanner(path).feed(data, final=True)
+    assert found is not None
+    return found
+
+
+def _split(path: str) -> Tuple[str, int]:
+    """Return the raw frontmatter text and the byte offset where the body starts.
+
+    The file is read in :data:`CHUNK_SIZE` pieces until the closing
+    delimiter has been seen, so large bodies are never read.
+    """
+    scanner = _Scanner(path)
+    with open(path, "rb", buffering=0) as fh:
+        while True:
+            chunk = fh.read(CHUNK_SIZE)
+            found = scanner.feed(chunk, final=not chunk)
+            if found is not None:
+                return found
+            if len(scanner.buf) > MAX_FRONTMATTER:
+                raise FrontmatterError(f"{path}: frontmatter exceeds {MAX_FRONTMATTER} bytes")
+
+
+def read_frontmatter(path: "os.PathLike[str] | str") -> Dict[str, Any]:
+    """Read and parse only the frontmatter of the skill file at ``path``."""
+    path = os.fspath(path)
+    text, _ = _split(path)
+    return parse_frontmatter(text, path)
+
+
+def read_body(path: "os.PathLike[str] | str") -> str:
+    """Read the markdown body that follows the frontmatter block."""
+    path = os.fspath(path)
+    _, offset = _split(path)
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        return fh.read().decode("utf-8")
+
+
+def _heading(line: str) -> Optional[Tuple[int, str]]:
+    if not line.startswith("#"):
+        return None
+    level = len(line) - len(line.lstrip("#"))
+    if level > 6 or (len(line) > level and line[level] not in " \t\r\n"):
+        return None
+    return level, line[level:].strip().rstrip("#").strip()
+
+
+def iter_sections(path: "os.PathLike[str] | str", offset: Optional[int] = None) -> Iterator[Section]:
+    """Stream the body of ``path`` one :class:`Section` at a time.
+
+    Headings inside fenced code blocks are not treated as section breaks.
+    ``offset`` is the body offset if already known (see :class:`ParseResult`).
+    """
+    path = os.fspath(path)
+    if offset is None:
+        _, offset = _split(path)
+    heading, level = "", 0
+    lines: List[str] = []
+    fence = ""
+    with open(path, "r", encoding="utf-8", newline="") as fh:
+        fh.buffer.seek(offset)
+        for line in fh:
+            stripped = line.lstrip()
+            if stripped.startswith(("```", "~~~")):
+                marker = stripped[:3]
+                fence = "" if fence == marker else (fence or marker)
+            found = None if fence else _heading(line)
+            if found is None:
+                lines.append(line)
+                continue
+            if heading or level or "".join(lines).strip():
+                yield Section(heading, level, "".join(lines))
+            level, heading = found
+            lines = []
+    if heading or level or "".join(lines).strip():
+        yield Section(heading, level, "".join(lines))
+
+
+def _parse_one(path: str) -> ParseResult:
+    try:
+        text, offset = _split(path)
+        return ParseResult(path, parse_frontmatter(text, path), offset)
+    except (OSError, UnicodeDecodeError, FrontmatterError) as exc:
+        return ParseResult(path, error=exc)
+
+
+def iter_frontmatter(
+    paths: Iterable["os.PathLike[str] | str"], max_workers: Optional[int] = None
+) -> Iterator[ParseResult]:
+    """Parse the frontmatter of ``paths`` on a thread pool, yielding in input order.
+
+    Results are produced as soon as they are ready (and in order), so callers
+    can start consuming before the whole batch is parsed.  Errors are
+    reported on the result rather than raised.
+    """
+    paths = [os.fspath(p) for p in paths]
+    if len(paths) <= 1 or max_workers == 1:
+        yield from map(_parse_one, paths)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        yield from pool.map(_parse_one, paths)
+
+
+def read_frontmatter_many(
+    paths: Iterable["os.PathLike[str] | str"], max_workers: Optional[int] = None
+) -> List[ParseResult]:
+    """Batch form of :func:`iter_frontmatter`."""
+    return list(iter_frontmatter(paths, max_workers))
@@ -0,0 +1,277 @@
+"""Skill registry backed by the persistent metadata index.
+
+Only metadata is loaded at startup.  A skill's markdown body and bundled
+scripts are read the first time they are accessed through :class:`Skill`.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set
+
+from .index import INDEX_FILENAME, SKILL_FILENAME, SkillIndex, SkillMeta
+from .parser import read_body
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import ResultCache
+    from .executor import ExecutionResult, SkillExecutor
+    from .orchestration import Invocation
+    from .retrieval import SkillRetriever
+    from .watch import SkillWatcher
+
+__all__ = ["Skill", "SkillNotFoundError", "SkillRegistry"]
+
+SCRIPTS_DIRNAME = "scripts"
+
+
+class SkillNotFoundError(KeyError):
+    """Raised when a skill name is not present in the registry."""
+
+
+class Skill:
+    """A loaded skill.  Body and scripts are read lazily and then cached."""
+
+    def __init__(self, meta: SkillMeta, root: str) -> None:
+        self.meta = meta
+        self.directory = os.path.join(root, *meta.path.split("/"))
+
+    def __repr__(self) -> str:
+        return f"Skill({self.meta.name!r})"
+
+    @property
+    def name(self) -> str:
+        return self.meta.name
+
+    @property
+    def description(self) -> str:
+        return self.meta.description
+
+    @property
+    def skill_file(self) -> str:
+        return os.path.join(self.directory, SKILL_FILENAME)
+
+    @cached_property
+    def body(self) -> str:
+        """The markdown body of ``SKILL.md``, without the frontmatter."""
+        return read_body(self.skill_file)
+
+    @cached_property
+    def scripts(self) -> Dict[str, str]:
+        """Bundled scripts, mapping file name (relative to ``scripts/``) to path."""
+        base = os.path.join(self.directory, SCRIPTS_DIRNAME)
+        found: Dict[str, str] = {}
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "__pycache__"]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                found[os.path.relpath(path, base).replace(os.sep, "/")] = path
+        return dict(sorted(found.items()))
+
+    def script_path(self, script: str) -> str:
+        """Return the absolute path of a bundled script."""
+        try:
+            return self.scripts[script]
+        except KeyError:
+            raise FileNotFoundError(f"skill {self.name!r} has no script {script!r}") from None
+
+    def read_script(self, script: str) -> str:
+        """Return the source text of a bundled script."""
+        with open(self.script_path(script), "r", encoding="utf-8") as fh:
+            return fh.read()
+
+
+class SkillRegistry:
+    """Registry of the skills found below ``root``.
+
+    On construction the index file is read and revalidated against the tree;
+    it is rewritten only if something changed.  Pass ``index_path=None``
+    together with ``persist=False`` to keep the index in memory only.
+
+    ``cache`` is the :class:`~skills.cache.ResultCache` used by the default
+    executor and by executors created without one; the registry drops its
+    entries for skills that change.
+    """
+
+    def __init__(
+        self,
+        root: "os.PathLike[str] | str",
+        index_path: "Optional[os.PathLike[str] | str]" = None,
+        persist: bool = True,
+        cache: "Optional[ResultCache]" = None,
+    ) -> None:
+        self.root = os.path.abspath(os.fspath(root))
+        self.index_path = os.fspath(index_path) if index_path else os.path.join(self.root, INDEX_FILENAME)
+        self.persist = persist
+        self.cache = cache
+        self._lock = threading.RLock()
+        self._loaded: Dict[str, Skill] = {}
+        self._retriever: "Optional[SkillRetriever]" = None
+        self._executor: "Optional[SkillExecutor]" = None
+        self._index = SkillIndex.read(self.root, self.index_path) if persist else SkillIndex(self.root)
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Revalidate the index against the skill tree.  Returns True on change."""
+        with self._lock:
+            index = self._index.copy()
+            if not index.rebuild():
+                return False
+            self._publish(index)
+            return True
+
+    def update_paths(self, paths: Iterable["os.PathLike[str] | str"]) -> Set[str]:
+        """Revalidate only the skills at or below ``paths``.
+
+        Returns the names of the skills that were added, changed or removed.
+        Much cheaper than :meth:`refresh` when the changed paths are known,
+        e.g. from a :class:`~skills.watch.SkillWatcher`.
+        """
+        with self._lock:
+            index = self._index.copy()
+            if not index.update_paths(os.fspath(p) for p in paths):
+                return set()
+            return self._publish(index)
+
+    def _publish(self, index: SkillIndex) -> Set[str]:
+        """Swap in ``index`` and update everything derived from the changed skills.
+
+        The index is replaced with a single assignment, so readers holding
+        :meth:`snapshot` keep a consistent view while the new one is applied.
+        """
+        before = {m.name: m for m in self._index}
+        changed = {m.name for m in index if before.get(m.name) is not m}
+        changed.update(before.keys() - set(index.names()))
+        retriever = self._retriever
+        if retriever is None:
+            self._index = index
+        else:
+            # select_skills reads the index under the same lock, so it never
+            # pairs the new index with half-updated retrieval state.
+            with retriever.batch():
+                self._index = index
+                self._sync_retriever(retriever, changed)
+        self.invalidate(changed)
+        if self.persist:
+            try:
+                index.write(self.index_path)
+            except OSError:
+                pass  # a read-only tree still works, just without caching
+        return changed
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        """Drop loaded skills and cached results for ``names``.
+
+        Called on index changes; also useful when only a skill's scripts
+        changed, which does not affect its index entry.
+        """
+        names = list(names)
+        with self._lock:
+            for name in names:
+                self._loaded.pop(name, None)
+        if self.cache is not None:
+            for name in names:
+                self.cache.invalidate(name)
+
+    def snapshot(self) -> SkillIndex:
+        """The current index.  It is never mutated once published."""
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[SkillMeta]:
+        return iter(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def names(self) -> List[str]:
+        return self._index.names()
+
+    def get(self, name: str) -> SkillMeta:
+        """Return the indexed metadata of ``name`` without touching the skill files."""
+        meta = self._index.get(name)
+        if meta is None:
+            raise SkillNotFoundError(name)
+        return meta
+
+    def load(self, name: str) -> Skill:
+        """Return the :class:`Skill` for ``name``; its body is read on first access."""
+        with self._lock:
+            skill = self._loaded.get(name)
+            if skill is None:
+                skill = self._loaded[name] = Skill(self.get(name), self.root)
+            return skill
+
+    def _sync_retriever(self, retriever: "SkillRetriever", changed: Set[str]) -> None:
+        """Apply index changes to the retriever, touching only changed skills."""
+        for name in changed:
+            meta = self._index.get(name)
+            if meta is None:
+                retriever.remove(name)
+            else:
+                retriever.update(meta)
+
+    @property
+    def retriever(self) -> "SkillRetriever":
+        """The BM25 retriever over all skills, built on first use (requires NumPy)."""
+        with self._lock:
+            if self._retriever is None:
+                from .retrieval import SkillRetriever
+
+                self._retriever = SkillRetriever(self._index)
+            return self._retriever
+
+    def select_skills(self, query: str, k: int = 5) -> List[SkillMeta]:
+        """Return the ``k`` skills most relevant to ``query``, best first."""
+        retriever = self.retriever
+        with retriever.batch():
+            index = self._index
+            hits = retriever.search(query, k)
+        return [meta for meta in (index.get(name) for name, _ in hits) if meta is not None]
+
+    @property
+    def executor(self) -> "SkillExecutor":
+        """The default :class:`~skills.executor.SkillExecutor`, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                from .executor import SkillExecutor
+
+                self._executor = SkillExecutor(self)
+            return self._executor
+
+    async def invoke(self, skill: str, script: str, args: Iterable[str] = (), **kwargs: Any) -> "ExecutionResult":
+        """Run one script without blocking the event loop."""
+        from .orchestration import Invocation
+
+        results = await self.invoke_many([Invocation(skill, script, tuple(args), **kwargs)])
+        return next(iter(results.values()))
+
+    async def invoke_many(
+        self,
+        invocations: "Iterable[Invocation]",
+        max_concurrency: Optional[int] = None,
+        resource_limits: Optional[Mapping[str, int]] = None,
+    ) -> "Dict[str, ExecutionResult]":
+        """Run ``invocations`` concurrently; see :func:`skills.orchestration.invoke_many`."""
+        from .orchestration import invoke_many
+
+        return await invoke_many(self.executor, invocations, max_concurrency, resource_limits)
+
+    def watch(self, **kwargs: Any) -> "SkillWatcher":
+        """Start a :class:`~skills.watch.SkillWatcher` reloading changed skills.
+
+        Keyword arguments are passed to the watcher; stop it with ``stop()``.
+        """
+        from .watch import SkillWatcher
+
+        return SkillWatcher(self, **kwargs).start()
+
+    def close(self) -> None:
+        """Shut down the default executor, if one was started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.close()
@@ -0,0 +1,188 @@
+"""BM25 relevance ranking over skill names and descriptions.
+
+The index is stored term-major: for every term, a pair of NumPy arrays holds
+the ids of the documents containing it and the term frequency in each.
+Scoring a query gathers the postings of its terms and reduces them with one
+``np.bincount`` -- a sparse matrix-vector product -- followed by an
+``argpartition`` for the top ``k``.
+
+Only raw term frequencies and document lengths are stored; IDF and length
+normalisation are applied at query time, so adding, replacing or removing a
+single skill touches only the postings of that skill's terms.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, ContextManager, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from . import instrument
+from .index import SkillMeta
+
+__all__ = ["SkillRetriever", "tokenize"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to use used "
+    "when which with you your".split()
+)
+_EMPTY_IDS = np.empty(0, dtype=np.int32)
+_EMPTY_TF = np.empty(0, dtype=np.float32)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case ``text`` and split it into alphanumeric terms, minus stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _document(meta: SkillMeta) -> List[str]:
+    return tokenize(meta.name.replace("-", " ").replace("_", " ")) + tokenize(meta.description)
+
+
+class SkillRetriever:
+    """Incrementally updatable BM25 index over :class:`SkillMeta` entries."""
+
+    def __init__(self, metas: Iterable[SkillMeta] = (), k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._slots: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+        self._terms: List[Dict[str, int]] = []
+        self._free: List[int] = []
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._total_length = 0.0
+        self._norm: Optional[np.ndarray] = None
+        self._bulk_load(list(metas))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def batch(self) -> ContextManager[Any]:
+        """Hold off searches while a group of updates is applied.
+
+        Searches take the same lock, so they see either none or all of the
+        updates made inside ``with retriever.batch():``.
+        """
+        return self._lock
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
+
+    def _bulk_load(self, metas: List[SkillMeta]) -> None:
+        grouped: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths = []
+        for meta in metas:
+            if meta.name in self._slots:
+                continue
+            slot = len(self._names)
+            self._slots[meta.name] = slot
+            self._names.append(meta.name)
+            terms = _count(_document(meta))
+            self._terms.append(terms)
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                ids, tfs = grouped.setdefault(term, ([], []))
+                ids.append(slot)
+                tfs.append(tf)
+        self._postings = {
+            term: (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (ids, tfs) in grouped.items()
+        }
+        self._lengths = np.asarray(lengths, dtype=np.float32)
+        self._total_length = float(sum(lengths))
+        self._norm = None
+
+    def add(self, meta: SkillMeta) -> None:
+        """Add ``meta``, replacing any existing entry of the same name."""
+        with self._lock:
+            if meta.name in self._slots:
+                self.remove(meta.name)
+            terms = _count(_document(meta))
+            if self._free:
+                slot = self._free.pop()
+                self._names[slot] = meta.name
+                self._terms[slot] = terms
+            else:
+                slot = len(self._names)
+                self._names.append(meta.name)
+                self._terms.append(terms)
+                self._lengths = np.append(self._lengths, np.float32(0))
+            self._slots[meta.name] = slot
+            length = sum(terms.values())
+            self._lengths[slot] = length
+            self._total_length += length
+            for term, tf in terms.items():
+                ids, tfs = self._postings.get(term, (_EMPTY_IDS, _EMPTY_TF))
+                self._postings[term] = (np.append(ids, np.int32(slot)), np.append(tfs, np.float32(tf)))
+            self._norm = None
+
+    update = add
+
+    def remove(self, name: str) -> bool:
+        """Remove the entry for ``name``; returns False if it was not indexed."""
+        with self._lock:
+            slot = self._slots.pop(name, None)
+            if slot is None:
+                return False
+            for term in self._terms[slot]:
+                ids, tfs = self._postings[term]
+                keep = ids != slot
+                if keep.any():
+                    self._postings[term] = (ids[keep], tfs[keep])
+                else:
+                    del self._postings[term]
+            self._total_length -= float(self._lengths[slot])
+            self._lengths[slot] = 0
+            self._names[slot] = None
+            self._terms[slot] = {}
+            self._free.append(slot)
+            self._norm = None
+            return True
+
+    def _length_norm(self) -> np.ndarray:
+        norm = self._norm
+        if norm is None:
+            avgdl = self._total_length / len(self._slots) if self._slots else 1.0
+            norm = self.k1 * (1.0 - self.b + self.b * self._lengths / max(avgdl, 1e-9))
+            self._norm = norm = norm.astype(np.float32)
+        return norm
+
+    def scores(self, query: str) -> np.ndarray:
+        """Return the BM25 score of every slot for ``query`` (0 for empty slots)."""
+        with self._lock:
+            n_slots = len(self._names)
+            postings = [self._postings[t] for t in set(tokenize(query)) if t in self._postings]
+            if not postings:
+                return np.zeros(n_slots, dtype=np.float32)
+            n_docs = len(self._slots)
+            norm = self._length_norm()
+            ids = np.concatenate([p[0] for p in postings])
+            tfs = np.concatenate([p[1] for p in postings])
+            df = np.array([len(p[0]) for p in postings], dtype=np.float32)
+            idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+            weights = np.repeat(idf, df.astype(np.int64)) * tfs * (self.k1 + 1.0) / (tfs + norm[ids])
+            return np.bincount(ids, weights=weights, minlength=n_slots).astype(np.float32)
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(name, score)`` pairs with a positive score, best first."""
+        with instrument.span("retrieval.search", k=k), self._lock:
+            scores = self.scores(query)
+            if k <= 0 or not scores.size:
+                return []
+            k = min(k, scores.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            names = self._names
+            return [(names[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+def _count(tokens: List[str]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for token in tokens:
+        counts[token] = counts.get(token, 0) + 1
+    return counts
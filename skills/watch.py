@@ -0,0 +1,264 @@
+"""Live reloading of changed skills.
+
+:class:`SkillWatcher` follows a registry's skill tree in a background thread
+and hands the affected skill directories to
+:meth:`SkillRegistry.update_paths`.  Only those entries are re-parsed; their
+retrieval vectors, loaded skills and cached results are refreshed with them.
+
+On Linux the watcher uses inotify (through ``ctypes``, no extra dependency).
+Where inotify is unavailable or the watch limit is exhausted it falls back
+to polling, which stats every ``SKILL.md`` and re-parses only changed ones;
+polling does not notice edits to bundled scripts.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from .index import SKILL_FILENAME
+from .registry import SkillRegistry
+
+__all__ = ["SkillWatcher"]
+
+logger = logging.getLogger(__name__)
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules"})
+
+ChangeCallback = Callable[[Set[str]], None]
+
+
+class _Inotify:
+    """Minimal recursive inotify wrapper."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: Dict[int, str] = {}
+
+    def add_tree(self, root: str) -> None:
+        """Watch ``root`` and every non-hidden directory below it."""
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            wd = self._add(self.fd, os.fsencode(path), _MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                    continue
+                raise OSError(err, f"inotify_add_watch failed for {path}")
+            self.paths[wd] = path
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if (
+                    entry.is_dir(follow_symlinks=False)
+                    and not entry.name.startswith(".")
+                    and entry.name not in _SKIP_DIRS
+                ):
+                    stack.append(entry.path)
+
+    def read(self, timeout: float) -> Optional[list]:
+        """Return ``(mask, path)`` events, or ``None`` if the queue overflowed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            if mask & _IN_IGNORED:
+                self.paths.pop(wd, None)
+                continue
+            base = self.paths.get(wd)
+            if base is None:
+                continue
+            path = os.path.join(base, os.fsdecode(name)) if name else base
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                self.add_tree(path)
+            events.append((mask, path))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SkillWatcher:
+    """Keep ``registry`` in sync with its skill tree until stopped.
+
+    ``backend`` is ``"inotify"``, ``"polling"`` or ``None`` for automatic
+    selection.  Changes arriving within ``debounce`` seconds are applied as
+    one batch; ``poll_interval`` is the polling period.  ``on_change`` is
+    called with the names of the skills each batch changed.
+    """
+
+    def __init__(
+        self,
+        registry: SkillRegistry,
+        backend: Optional[str] = None,
+        poll_interval: float = 2.0,
+        debounce: float = 0.1,
+        on_change: Optional[ChangeCallback] = None,
+    ) -> None:
+        if backend not in (None, "inotify", "polling"):
+            raise ValueError(f"unknown watcher backend {backend!r}")
+        self.registry = registry
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.on_change = on_change
+        self._inotify: Optional[_Inotify] = None
+        if backend != "polling" and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+                self._inotify.add_tree(registry.root)
+            except (OSError, AttributeError) as exc:
+                if self._inotify is not None:
+                    self._inotify.close()
+                    self._inotify = None
+                if backend == "inotify":
+                    raise
+                logger.info("inotify unavailable (%s); polling %s", exc, registry.root)
+        elif backend == "inotify":
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self.backend = "inotify" if self._inotify is not None else "polling"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SkillWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> "SkillWatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="skills-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._inotify is not None:
+                    self._watch_once(self._inotify)
+                else:
+                    self._notify(self.registry.update_paths([self.registry.root]))
+                    self._stop.wait(self.poll_interval)
+            except Exception:  # keep watching; one bad batch must not stop reloads
+                logger.exception("error while reloading skills")
+                self._stop.wait(self.poll_interval)
+
+    def _watch_once(self, inotify: _Inotify) -> None:
+        events = inotify.read(0.5)
+        if events == []:
+            return
+        deadline = time.monotonic() + self.debounce
+        while events is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = inotify.read(remaining)
+            events = None if more is None else events + more
+        if events is None:
+            logger.warning("inotify queue overflowed; rescanning %s", self.registry.root)
+            self._notify(self.registry.update_paths([self.registry.root]))
+            return
+        paths = self._affected(path for _, path in events)
+        if not paths:
+            return
+        changed = self.registry.update_paths(paths)
+        # Script edits do not change the index entry, but loaded skills and
+        # cached results of that skill are stale all the same.
+        touched = self._skills_under(paths) - changed
+        if touched:
+            self.registry.invalidate(touched)
+        self._notify(changed | touched)
+
+    def _affected(self, paths: Iterable[str]) -> Set[str]:
+        """Map changed filesystem paths to the directories to revalidate."""
+        root = self.registry.root
+        skill_dirs = set(self.registry.snapshot().paths())
+        affected: Set[str] = set()
+        for path in paths:
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            if rel == "." or rel.startswith("../"):
+                continue
+            parts = rel.split("/")
+            if any(p.startswith(".") or p in _SKIP_DIRS for p in parts):
+                continue
+            for depth in range(len(parts), 0, -1):
+                candidate = "/".join(parts[:depth])
+                if candidate in skill_dirs:
+                    affected.add(os.path.join(root, *parts[:depth]))
+                    break
+            else:
+                if parts[-1] == SKILL_FILENAME:
+                    affected.add(os.path.dirname(path))
+                elif os.path.isdir(path) or "." not in parts[-1]:
+                    # A new, moved or deleted directory may hold whole skills.
+                    affected.add(path)
+        return affected
+
+    def _skills_under(self, paths: Set[str]) -> Set[str]:
+        root = self.registry.root
+        rels = {os.path.relpath(p, root).replace(os.sep, "/") for p in paths}
+        return {meta.name for meta in self.registry.snapshot() if meta.path in rels}
+
+    def _notify(self, changed: Set[str]) -> None:
+        if changed and self.on_change is not None:
+            self.on_change(changed)
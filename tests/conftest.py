@@ -0,0 +1,28 @@
+import os
+import textwrap
+
+import pytest
+
+
+def write_skill(root, path, name=None, description="A test skill.", extra="", body="# Body\n", scripts=None):
+    """Create ``root/path/SKILL.md`` (and scripts) and return the skill directory."""
+    directory = os.path.join(str(root), *path.split("/"))
+    os.makedirs(directory, exist_ok=True)
+    front = f"name: {name}\n" if name else ""
+    front += f"description: {description}\n" + textwrap.dedent(extra)
+    with open(os.path.join(directory, "SKILL.md"), "w", encoding="utf-8") as fh:
+        fh.write(f"---\n{front}---\n{body}")
+    for script, source in (scripts or {}).items():
+        script_path = os.path.join(directory, "scripts", script)
+        os.makedirs(os.path.dirname(script_path), exist_ok=True)
+        with open(script_path, "w", encoding="utf-8") as fh:
+            fh.write(textwrap.dedent(source))
+    return directory
+
+
+@pytest.fixture
+def make_skill(tmp_path):
+    def make(path, **kwargs):
+        return write_skill(tmp_path, path, **kwargs)
+
+    return make
@@ -0,0 +1,90 @@
+import pickle
+
+import pytest
+
+from skills import ArtifactStore, SkillRegistry
+from skills.artifacts import Artifact, artifact_map
+from skills.executor import SkillExecutor
+
+UPPER = """
+src = ARTIFACTS["src"].view()
+out = ARTIFACTS["out"].view()
+out[: len(src)] = bytes(src).upper()
+print(len(src), ARTIFACTS["src"].kind)
+"""
+
+
+@pytest.fixture
+def store():
+    with ArtifactStore() as store:
+        yield store
+
+
+def test_file_artifact_is_a_read_only_map(store, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    artifact = store.put_file(path)
+    assert len(artifact) == 10 and not artifact.writable
+    assert artifact.read() == b"0123456789"
+    assert artifact.read(3, offset=8) == b"89"
+    with pytest.raises(TypeError):
+        artifact.view()[0] = 0
+    assert [bytes(c) for c in artifact.iter_chunks(4)] == [b"0123", b"4567", b"89"]
+    artifact.close()
+    assert artifact.read(2) == b"01"  # maps again on demand
+    artifact.close()
+
+
+def test_empty_file(store, tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    artifact = store.put_file(path)
+    assert artifact.read() == b"" and list(artifact.iter_chunks()) == []
+
+
+def test_shared_memory_round_trips_through_pickle(store):
+    artifact = store.put_bytes(b"hello world", label="greeting")
+    assert artifact.writable and artifact.label == "greeting"
+    copy = pickle.loads(pickle.dumps(artifact))
+    assert copy is not artifact and copy.read() == b"hello world"
+    copy.view()[:5] = b"HELLO"
+    assert artifact.read(5) == b"HELLO"
+    copy.close()
+    with pytest.raises(ValueError):
+        list(artifact.iter_chunks(0))
+
+
+def test_release_and_close_unlink_blocks(store):
+    first = store.create(16)
+    second = store.create(16)
+    store.release(first)
+    with pytest.raises(FileNotFoundError):
+        pickle.loads(pickle.dumps(first)).view()
+    store.close()
+    with pytest.raises(FileNotFoundError):
+        pickle.loads(pickle.dumps(second)).view()
+
+
+def test_artifact_map_rejects_other_values(store):
+    assert artifact_map(None) == {}
+    with pytest.raises(TypeError, match="'x' is bytes"):
+        artifact_map({"x": b"data"})
+
+
+def test_workers_share_artifacts_without_destroying_them(store, tmp_path, make_skill):
+    make_skill("upper", scripts={"upper.py": UPPER})
+    registry = SkillRegistry(tmp_path, persist=False)
+    src_path = tmp_path / "src.txt"
+    src_path.write_bytes(b"shared bytes")
+    src = store.put_file(src_path)
+    out = store.create(64)
+    # One call per worker: each worker exits after attaching, which used to
+    # unlink the block through the resource tracker.
+    with SkillExecutor(registry, max_calls_per_worker=1) as executor:
+        for _ in range(2):
+            result = executor.run("upper", "upper.py", artifacts={"src": src, "out": out})
+            assert result.ok, result.error
+            assert result.stdout == "12 file\n"
+    assert out.read(12) == b"SHARED BYTES"
+    with pickle.loads(pickle.dumps(out)) as attached:
+        assert isinstance(attached, Artifact) and attached.read(6) == b"SHARED"
@@ -0,0 +1,58 @@
+import json
+
+from skills import bench
+from skills.index import discover
+
+
+def test_generate_library(tmp_path):
+    bench.generate_library(str(tmp_path), 5, with_script=True)
+    assert len(list(discover(str(tmp_path)))) == 5
+    assert (tmp_path / "group00" / "skill-00000" / "scripts" / "loop.py").is_file()
+
+
+def test_bench_library_per_skill_and_aggregate(tmp_path):
+    bench.generate_library(str(tmp_path), 3)
+    per_skill = bench.bench_library(str(tmp_path), repeat=2)
+    assert per_skill["skills"] == 3
+    assert set(per_skill["parse"]) == {"skill-00000", "skill-00001", "skill-00002"}
+    assert per_skill["parse"]["skill-00000"]["n"] == 2
+    assert per_skill["index_load"]["n"] == 2
+
+    aggregate = bench.bench_library(str(tmp_path), repeat=2, per_skill=False)
+    assert aggregate["parse"]["n"] == 3
+    assert aggregate["parse"]["p99_ms"] >= aggregate["parse"]["p50_ms"] > 0
+
+
+def test_run_benchmarks_report(tmp_path, make_skill):
+    make_skill(
+        "repo/sum",
+        extra="bench:\n  sum.py: ['100']\n",
+        scripts={"sum.py": "import sys\nprint(sum(range(int(sys.argv[1]))))\n"},
+    )
+    report = bench.run_benchmarks(str(tmp_path / "repo"), sizes=[4], repeat=2, queries=3)
+    json.dumps(report)
+    assert report["repo"]["scripts"]["sum/sum.py"]["failures"] == 0
+    assert "sum" in report["repo"]["parse"]
+    synthetic = report["synthetic"]["4"]
+    assert synthetic["skills"] == 4
+    assert synthetic["parse"]["n"] == 4
+    assert synthetic["scripts"]["skill-00000/loop.py"]["n"] == 2
+
+
+def test_compare_flags_slower_latency_and_memory_only():
+    baseline = {"repo": None, "synthetic": {"10": {"index_build_ms": 10.0, "skills": 10, "x": {"peak_rss_kb": 100}}}}
+    current = {"repo": None, "synthetic": {"10": {"index_build_ms": 13.0, "skills": 20, "x": {"peak_rss_kb": 110}}}}
+    assert bench.compare(baseline, current) == ["synthetic.10.index_build_ms: 10.000 -> 13.000 (+30%)"]
+    assert bench.compare(baseline, current, threshold=0.5) == []
+
+
+def test_main_writes_report_and_compares(tmp_path, capsys):
+    out = tmp_path / "report.json"
+    assert bench.main(["--sizes", "3", "--repeat", "1", "--queries", "2", "--no-scripts", "-o", str(out)]) == 0
+    report = json.loads(out.read_text())
+    assert report["synthetic"]["3"]["skills"] == 3
+    report["synthetic"]["3"]["index_build_ms"] = 1e-6
+    out.write_text(json.dumps(report))
+    args = ["--sizes", "3", "--repeat", "1", "--queries", "2", "--no-scripts", "--compare", str(out)]
+    assert bench.main(args) == 1
+    assert "regression: synthetic.3.index_build_ms" in capsys.readouterr().err
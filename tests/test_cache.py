@@ -0,0 +1,245 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from skills import ResultCache, SkillRegistry
+from skills.cache import is_cacheable
+from skills.executor import ExecutionResult, SkillExecutor
+from skills.index import SkillMeta
+
+COUNT = """
+import os, sys, uuid
+open(os.path.join(sys.argv[1], uuid.uuid4().hex), "w").close()
+print(len(os.listdir(sys.argv[1])))
+"""
+
+
+def result(stdout="out", skill="s"):
+    return ExecutionResult(skill, "run.py", [], returncode=0, stdout=stdout)
+
+
+@pytest.fixture
+def registry(tmp_path, make_skill):
+    make_skill("skills/cached", extra="cacheable: true\n", scripts={"count.py": COUNT})
+    make_skill("skills/plain", scripts={"count.py": COUNT})
+    make_skill("skills/random", extra="cacheable: true\ndeterministic: false\n", scripts={"count.py": COUNT})
+    registry = SkillRegistry(tmp_path / "skills", persist=False, cache=ResultCache())
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def counter(tmp_path):
+    """A directory the script adds a file to on every run; not part of the key."""
+    path = tmp_path / "runs"
+    path.mkdir()
+    return str(path)
+
+
+def test_is_cacheable():
+    meta = SkillMeta("s", "", "s")
+    assert not is_cacheable(meta)
+    meta.metadata = {"cacheable": True}
+    assert is_cacheable(meta)
+    meta.metadata = {"cacheable": True, "deterministic": False}
+    assert not is_cacheable(meta)
+
+
+def test_key_covers_skill_script_args_and_input_files(registry, tmp_path):
+    cache = registry.cache
+    skill = registry.load("cached")
+    script = skill.script_path("count.py")
+    data = tmp_path / "input.txt"
+    data.write_text("one")
+    key = cache.make_key(skill.meta, script, [str(data)])
+    assert cache.make_key(skill.meta, script, [str(data)]) == key
+    assert cache.make_key(skill.meta, script, [str(data), "-v"]) != key
+
+    data.write_text("two")
+    assert cache.make_key(skill.meta, script, [str(data)]) != key
+    key = cache.make_key(skill.meta, script, [str(data)])
+
+    with open(script, "a") as fh:
+        fh.write("# edited\n")
+    assert cache.make_key(skill.meta, script, [str(data)]) != key
+    key = cache.make_key(skill.meta, script, [str(data)])
+
+    edited = SkillMeta(**{**skill.meta.to_dict(), "digest": "0" * 64})
+    assert cache.make_key(edited, script, [str(data)]) != key
+
+
+def test_relative_arguments_resolve_against_cwd(registry, tmp_path):
+    cache = registry.cache
+    skill = registry.load("cached")
+    script = skill.script_path("count.py")
+    (tmp_path / "input.txt").write_text("one")
+    key = cache.make_key(skill.meta, script, ["input.txt"], cwd=str(tmp_path))
+    (tmp_path / "input.txt").write_text("two")
+    assert cache.make_key(skill.meta, script, ["input.txt"], cwd=str(tmp_path)) != key
+
+
+def test_executor_replays_cacheable_results_only(registry, counter):
+    executor = registry.executor
+    first = executor.run("cached", "count.py", [counter])
+    second = executor.run("cached", "count.py", [counter])
+    assert first.stdout == "1\n" and not first.cached
+    assert second.stdout == "1\n" and second.cached
+    assert len(os.listdir(counter)) == 1
+
+    for name in ("plain", "random"):
+        assert not executor.run(name, "count.py", [counter]).cached
+        assert not executor.run(name, "count.py", [counter]).cached
+    assert len(os.listdir(counter)) == 5
+    assert registry.cache.stats.stores == 1
+
+
+def test_failed_runs_are_not_stored(registry, tmp_path):
+    missing = str(tmp_path / "no-such-dir")
+    assert not registry.executor.run("cached", "count.py", [missing]).ok
+    assert registry.cache.stats.stores == 0
+
+
+def test_registry_invoke_uses_the_cache(registry, counter):
+    async def main():
+        first = await registry.invoke("cached", "count.py", [counter])
+        return first, await registry.invoke("cached", "count.py", [counter])
+
+    first, second = asyncio.run(main())
+    assert not first.cached and second.cached
+    assert SkillExecutor(registry).cache is registry.cache
+
+
+def test_memory_tier_is_lru_bounded():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", result("a"))
+    cache.put("b", result("b"))
+    assert cache.get("a").stdout == "a"
+    cache.put("c", result("c"))
+    assert cache.get("b") is None
+    assert cache.get("a").stdout == "a" and cache.get("c").stdout == "c"
+    assert cache.stats.evictions == 1
+    assert cache.stats.to_dict()["hits"] == 3
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    ResultCache(tmp_path / "cache").put("k" * 64, result("stored"))
+    other = ResultCache(tmp_path / "cache")
+    hit = other.get("k" * 64)
+    assert hit.stdout == "stored"
+    assert other.stats.disk_hits == 1
+    assert other.get("k" * 64) is not None
+    assert other.stats.memory_hits == 1
+    assert other.stats.hit_rate == 1.0
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = ResultCache(tmp_path / "cache", ttl=0.2)
+    cache.put("k" * 64, result())
+    assert cache.get("k" * 64) is not None
+    time.sleep(0.3)
+    assert cache.get("k" * 64) is None
+    assert ResultCache(tmp_path / "cache", ttl=0.2).get("k" * 64) is None
+    assert cache.stats.expirations >= 1
+    assert not any(files for _, _, files in os.walk(tmp_path / "cache"))
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    probe = ResultCache(tmp_path / "probe")
+    probe.put("0" * 64, result("x" * 1000))
+    entry_size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(tmp_path / "probe") for f in fs)
+
+    cache = ResultCache(tmp_path / "cache", max_entries=1, max_disk_bytes=int(entry_size * 3.5))
+    keys = [str(i) * 64 for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, result("x" * 1000))
+        os.utime(cache._path(key), (i, i))
+    cache.get(keys[0])  # refreshes its recency on disk
+    cache.put(keys[3], result("x" * 1000))
+
+    fresh = ResultCache(tmp_path / "cache")
+    assert fresh.get(keys[1]) is None
+    assert all(fresh.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    assert cache.stats.evictions >= 1
+
+
+def test_invalidate_and_clear(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    cache.put("a" * 64, result(skill="one"))
+    cache.put("b" * 64, result(skill="one"))
+    cache.put("c" * 64, result(skill="two"))
+    assert cache.invalidate("one") == 2
+    assert cache.invalidate("one") == 0
+    assert len(cache._memory) == 1
+    cache.clear()
+    assert cache.get("c" * 64) is None
+
+
+def test_registry_invalidate_drops_cached_entries(registry, counter):
+    registry.executor.run("cached", "count.py", [counter])
+    assert len(registry.cache._memory) == 1
+    registry.invalidate(["cached"])
+    assert len(registry.cache._memory) == 0
+
+
+def test_artifacts_bypass_the_cache(registry, counter):
+    from skills import ArtifactStore
+
+    with ArtifactStore() as store:
+        artifact = store.put_bytes(b"data")
+        for _ in range(2):
+            res = registry.executor.run("cached", "count.py", [counter], artifacts={"a": artifact})
+            assert res.ok and not res.cached
+    assert registry.cache.stats.stores == 0
+
+
+def test_key_covers_helper_modules_across_sessions(tmp_path, make_skill):
+    make_skill(
+        "skills/helped",
+        extra="cacheable: true\n",
+        scripts={"run.py": "import helpers\nprint(helpers.VALUE)\n", "helpers.py": "VALUE = 1\n"},
+    )
+
+    def run():
+        registry = SkillRegistry(tmp_path / "skills", persist=False, cache=ResultCache(tmp_path / "cache"))
+        try:
+            res = registry.executor.run("helped", "run.py")
+            return res.stdout.strip(), res.cached
+        finally:
+            registry.close()
+
+    assert run() == ("1", False)
+    assert run() == ("1", True)
+    (tmp_path / "skills" / "helped" / "scripts" / "helpers.py").write_text("VALUE = 22\n")
+    assert run() == ("22", False)
+
+
+def test_overwriting_a_disk_entry_keeps_the_size_count(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    cache.put("a" * 64, result("x" * 100))
+    cache._disk_usage()
+    for _ in range(3):
+        cache.put("a" * 64, result("y" * 100))
+    assert cache._disk_usage() == os.path.getsize(cache._path("a" * 64))
+
+
+def test_digest_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr("skills.cache.MAX_DIGESTS", 3)
+    cache = ResultCache()
+    for i in range(5):
+        path = tmp_path / f"f{i}"
+        path.write_text(str(i))
+        cache._digest(str(path))
+    assert list(cache._digests) == [str(tmp_path / f"f{i}") for i in (2, 3, 4)]
+
+
+def test_importing_the_package_does_not_load_execution_support():
+    code = (
+        "import sys, skills; "
+        "print(sorted(m for m in ('asyncio', 'multiprocessing', 'skills.executor') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
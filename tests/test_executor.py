@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+
+import pytest
+
+from skills import SkillRegistry
+from skills.executor import SkillExecutor, dependency_key
+
+ECHO = """
+import os, sys
+print("args", sys.argv[1:], os.path.basename(os.getcwd()))
+mode = sys.argv[1] if len(sys.argv) > 1 else ""
+if mode == "fail":
+    raise ValueError("boom")
+if mode == "exit":
+    sys.exit(3)
+if mode == "sleep":
+    import time
+    time.sleep(30)
+"""
+
+BURN = """
+import sys, time
+end = time.process_time() + float(sys.argv[1])
+while time.process_time() < end:
+    pass
+print("done")
+"""
+
+
+@pytest.fixture
+def registry(tmp_path, make_skill):
+    make_skill("echo", scripts={"echo.py": ECHO, "burn.py": BURN})
+    make_skill("needs-json", extra="dependencies: [json, not_a_real_module_xyz]\n", scripts={"echo.py": ECHO})
+    return SkillRegistry(tmp_path, persist=False)
+
+
+SHELL = """
+import os
+print("before")
+os.system("echo from-shell; echo shell-err >&2")
+print("after")
+"""
+
+HELPER_MAIN = """
+import helpers
+print(helpers.WHO)
+"""
+
+
+@pytest.fixture
+def make_executor(registry):
+    executors = []
+
+    def make(**kwargs):
+        executor = SkillExecutor(registry, **kwargs)
+        executors.append(executor)
+        return executor
+
+    yield make
+    for executor in executors:
+        executor.close()
+
+
+def test_dependency_key_uses_import_names_verbatim():
+    assert dependency_key(["PIL", "bs4", " docx "]) == frozenset({"PIL", "bs4", "docx"})
+    assert dependency_key("pandas, numpy") == frozenset({"pandas", "numpy"})
+    assert dependency_key(None) == frozenset()
+
+
+def test_results_are_captured_and_worker_reused(make_executor, tmp_path):
+    executor = make_executor()
+    ok = executor.run("echo", "echo.py", ["x", 1], cwd=tmp_path)
+    assert ok.ok and ok.stdout == f"args ['x', '1'] {tmp_path.name}\n"
+    failed = executor.run("echo", "echo.py", ["fail"])
+    assert failed.returncode == 1 and "ValueError: boom" in failed.error
+    assert "ValueError: boom" in failed.stderr
+    exited = executor.run("echo", "echo.py", ["exit"])
+    assert exited.returncode == 3 and exited.error is None
+    assert ok.worker_pid == failed.worker_pid == exited.worker_pid
+    assert executor.worker_count == 1
+    assert os.getcwd() != str(tmp_path)
+
+
+def test_output_of_subprocesses_is_captured(tmp_path, make_skill, make_executor, capfd):
+    make_skill("shell", scripts={"run.py": SHELL})
+    executor = SkillExecutor(SkillRegistry(tmp_path, persist=False))
+    try:
+        result = executor.run("shell", "run.py")
+    finally:
+        executor.close()
+    assert result.ok
+    assert result.stdout == "before\nfrom-shell\nafter\n"
+    assert result.stderr == "shell-err\n"
+    assert "from-shell" not in capfd.readouterr().out
+
+
+def test_unknown_script_raises(make_executor):
+    with pytest.raises(FileNotFoundError):
+        make_executor().run("echo", "nope.py")
+
+
+def test_timeout_kills_and_replaces_worker(make_executor):
+    executor = make_executor(timeout=5)
+    first = executor.run("echo", "echo.py", ["warm"])
+    slow = executor.run("echo", "echo.py", ["sleep"], timeout=0.5)
+    assert slow.timed_out and slow.returncode is None and not slow.ok
+    after = executor.run("echo", "echo.py", ["again"])
+    assert after.ok
+    assert after.worker_pid != first.worker_pid
+    assert executor.worker_count == 1
+
+
+def test_workers_are_recycled_after_max_calls(make_executor):
+    executor = make_executor(max_calls_per_worker=2)
+    pids = [executor.run("echo", "echo.py").worker_pid for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+
+
+def test_cpu_time_limit_applies_per_call(make_executor):
+    executor = make_executor(cpu_time_limit=1)
+    results = [executor.run("echo", "burn.py", ["0.4"]) for _ in range(4)]
+    assert all(r.ok for r in results), [r.error for r in results]
+    assert len({r.worker_pid for r in results}) == 1
+
+    runaway = executor.run("echo", "burn.py", ["5"])
+    assert not runaway.ok
+    assert runaway.error == "CPU time limit exceeded"
+    assert executor.run("echo", "burn.py", ["0.1"]).ok
+
+
+def test_missing_dependencies_are_reported(make_executor, caplog):
+    result = make_executor().run("needs-json", "echo.py")
+    assert result.ok
+    assert result.missing_dependencies == ["not_a_real_module_xyz"]
+    assert "not_a_real_module_xyz" in caplog.text
+
+
+def test_total_worker_cap_evicts_idle_workers_of_other_sets(make_executor):
+    executor = make_executor(max_total_workers=1)
+    a = executor.run("echo", "echo.py")
+    b = executor.run("needs-json", "echo.py")
+    assert a.ok and b.ok and a.worker_pid != b.worker_pid
+    assert executor.worker_count == 1
+
+
+def test_idle_workers_are_stopped_after_idle_timeout(make_executor):
+    executor = make_executor(idle_timeout=0.2)
+    assert executor.run("echo", "echo.py").ok
+    assert executor.worker_count == 1
+    deadline = time.monotonic() + 5
+    while executor.worker_count and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert executor.worker_count == 0
+    assert executor.run("echo", "echo.py").ok
+
+
+def test_timeout_covers_waiting_for_a_worker(make_executor):
+    executor = make_executor(max_workers=1)
+    executor.warm()
+    busy = threading.Thread(target=executor.run, args=("echo", "burn.py", ["1"]))
+    busy.start()
+    time.sleep(0.2)
+    start = time.monotonic()
+    waited = executor.run("echo", "echo.py", timeout=0.3)
+    elapsed = time.monotonic() - start
+    busy.join()
+    assert waited.timed_out and waited.error == "no worker became available in time"
+    assert elapsed < 0.8
+    assert executor.worker_count == 1
+    assert executor.run("echo", "echo.py").ok
+
+
+def test_warm_gives_back_slots_when_start_fails(make_executor, monkeypatch):
+    executor = make_executor()
+
+    def fail(key):
+        raise OSError("cannot start")
+
+    monkeypatch.setattr(executor, "_spawn", fail)
+    with pytest.raises(OSError):
+        executor.warm(count=2)
+    assert executor.worker_count == 0
+
+
+def test_closed_executor_rejects_calls(make_executor):
+    executor = make_executor()
+    executor.close()
+    with pytest.raises(RuntimeError):
+        executor.run("echo", "echo.py")
+
+
+def test_helper_modules_do_not_leak_between_skills(tmp_path, make_skill, make_executor):
+    for name in ("helper-a", "helper-b"):
+        make_skill(name, scripts={"run.py": HELPER_MAIN, "helpers.py": f"WHO = {name!r}\n"})
+    registry = SkillRegistry(tmp_path, persist=False)
+    executor = SkillExecutor(registry)
+    try:
+        a = executor.run("helper-a", "run.py")
+        b = executor.run("helper-b", "run.py")
+        assert a.worker_pid == b.worker_pid
+        assert (a.stdout, b.stdout) == ("helper-a\n", "helper-b\n")
+
+        helper = os.path.join(registry.load("helper-a").directory, "scripts", "helpers.py")
+        with open(helper, "w") as fh:
+            fh.write("WHO = 'edited'\n")
+        assert executor.run("helper-a", "run.py").stdout == "edited\n"
+    finally:
+        executor.close()
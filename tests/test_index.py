@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+
+import pytest
+
+from skills import SkillNotFoundError, SkillRegistry
+from skills import index as index_module
+from skills.index import INDEX_FILENAME, SkillIndex, SkillMeta
+
+
+def bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+def test_registry_lists_metadata_and_loads_lazily(tmp_path, make_skill):
+    make_skill("pdf", name="pdf", description="Extract PDF text.", body="# PDF\nbody\n",
+               scripts={"extract.py": "print(1)\n"})
+    make_skill("office/xlsx", description="Spreadsheets.", extra="version: 2\n")
+
+    registry = SkillRegistry(tmp_path)
+
+    assert sorted(registry.names()) == ["pdf", "xlsx"]
+    xlsx = registry.get("xlsx")
+    assert xlsx.path == "office/xlsx"
+    assert xlsx.metadata == {"version": 2}
+    skill = registry.load("pdf")
+    assert "body" not in skill.__dict__
+    assert skill.body == "# PDF\nbody\n"
+    assert list(skill.scripts) == ["extract.py"]
+    assert skill.read_script("extract.py") == "print(1)\n"
+    with pytest.raises(SkillNotFoundError):
+        registry.get("missing")
+
+
+def test_warm_start_reads_index_without_parsing(tmp_path, make_skill, monkeypatch):
+    make_skill("a")
+    make_skill("b")
+    SkillRegistry(tmp_path)
+    assert os.path.exists(tmp_path / INDEX_FILENAME)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("SKILL.md parsed on warm start")
+
+    monkeypatch.setattr(SkillMeta, "from_file", fail)
+    registry = SkillRegistry(tmp_path)
+    assert sorted(registry.names()) == ["a", "b"]
+    assert registry.refresh() is False
+
+
+def test_touched_file_is_rehashed_but_not_reparsed(tmp_path, make_skill, monkeypatch):
+    directory = make_skill("a")
+    registry = SkillRegistry(tmp_path)
+    skill_file = os.path.join(directory, "SKILL.md")
+    bump_mtime(skill_file)
+    calls = []
+    monkeypatch.setattr(index_module, "read_frontmatter", lambda path: calls.append(path) or {})
+
+    assert registry.refresh() is True
+    assert calls == []
+    assert registry.get("a").mtime_ns == os.stat(skill_file).st_mtime_ns
+
+
+def test_modified_added_and_removed_skills(tmp_path, make_skill):
+    make_skill("a", description="old")
+    make_skill("b")
+    registry = SkillRegistry(tmp_path)
+
+    make_skill("a", description="new and longer")
+    make_skill("c")
+    os.remove(tmp_path / "b" / "SKILL.md")
+
+    assert registry.refresh() is True
+    assert registry.get("a").description == "new and longer"
+    assert sorted(registry.names()) == ["a", "c"]
+    assert sorted(m["name"] for m in json.loads((tmp_path / INDEX_FILENAME).read_text())["skills"]) == ["a", "c"]
+
+
+def test_invalid_skill_file_is_skipped(tmp_path, make_skill):
+    make_skill("good")
+    (tmp_path / "bad").mkdir()
+    (tmp_path / "bad" / "SKILL.md").write_text("no frontmatter\n")
+    assert SkillRegistry(tmp_path).names() == ["good"]
+
+
+@pytest.mark.parametrize("content", ["", "{", "[]", "42", '{"version": 99}', '{"version": 1, "skills": {}}',
+                                     '{"version": 1, "skills": [{"bogus": 1}]}'])
+def test_unusable_index_file_is_ignored(tmp_path, make_skill, content):
+    make_skill("a")
+    (tmp_path / INDEX_FILENAME).write_text(content)
+    assert SkillRegistry(tmp_path).names() == ["a"]
+
+
+def test_hidden_directories_and_nested_skills_are_skipped(tmp_path, make_skill):
+    make_skill("a")
+    make_skill("a/nested")
+    make_skill(".hidden/b")
+    assert SkillRegistry(tmp_path).names() == ["a"]
+
+
+def test_name_collision_is_logged_and_resolved_by_path(tmp_path, make_skill, caplog):
+    make_skill("z-dir", name="dup", description="z")
+    make_skill("a-dir", name="dup", description="a")
+    with caplog.at_level(logging.WARNING, logger="skills.index"):
+        registry = SkillRegistry(tmp_path, persist=False)
+    assert registry.get("dup").path == "a-dir"
+    assert "dup" in caplog.text
+
+    os.remove(tmp_path / "a-dir" / "SKILL.md")
+    registry.refresh()
+    assert registry.get("dup").path == "z-dir"
+
+
+def test_copy_is_independent(tmp_path, make_skill):
+    make_skill("a")
+    index = SkillIndex(tmp_path)
+    index.rebuild()
+    copy = index.copy()
+    make_skill("b")
+    copy.rebuild()
+    assert index.names() == ["a"]
+    assert sorted(copy.names()) == ["a", "b"]
@@ -0,0 +1,111 @@
+import io
+import json
+
+import pytest
+
+from skills import ResultCache, SkillRegistry, instrument
+
+HELLO = "print('hello')\n"
+
+
+@pytest.fixture
+def trace():
+    buffer = io.StringIO()
+    previous = instrument.enable(instrument.JsonLinesExporter(buffer))
+    assert previous is None
+
+    def records(kind=None):
+        lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        return [r for r in lines if kind is None or r["type"] == kind]
+
+    yield records
+    instrument.disable()
+
+
+def test_disabled_by_default_and_noop():
+    assert not instrument.enabled()
+    with instrument.span("anything", a=1) as span:
+        span.set("b", 2)
+    instrument.count("anything")
+    assert instrument.span("other") is span
+
+
+def test_spans_record_duration_attributes_and_errors(trace):
+    with instrument.span("outer", a=1) as span:
+        span.set("b", 2)
+    with pytest.raises(KeyError):
+        with instrument.span("failing"):
+            raise KeyError("x")
+    instrument.count("things", 3, kind="x")
+    outer, failing = trace("span")
+    assert outer["name"] == "outer" and outer["attrs"] == {"a": 1, "b": 2}
+    assert outer["duration_ms"] >= 0 and "error" not in outer
+    assert failing["error"] == "KeyError"
+    (counter,) = trace("counter")
+    assert (counter["name"], counter["value"], counter["attrs"]) == ("things", 3, {"kind": "x"})
+
+
+def test_exporters_switch_at_runtime(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    exporter = instrument.JsonLinesExporter(path)
+    instrument.enable(exporter)
+    try:
+        instrument.count("first")
+        other = io.StringIO()
+        assert instrument.enable(instrument.JsonLinesExporter(other)) is exporter
+        instrument.count("second")
+    finally:
+        instrument.disable().close()
+        exporter.close()
+    instrument.count("third")
+    assert [json.loads(line)["name"] for line in path.read_text().splitlines()] == ["first"]
+    assert json.loads(other.getvalue())["name"] == "second"
+
+
+def test_hot_paths_emit_spans_and_counters(trace, tmp_path, make_skill):
+    make_skill("skills/hello", extra="cacheable: true\n", scripts={"hello.py": HELLO})
+    registry = SkillRegistry(tmp_path / "skills", cache=ResultCache())
+    try:
+        for _ in range(2):
+            assert registry.executor.run("hello", "hello.py").ok
+    finally:
+        registry.close()
+    spans = {r["name"]: r for r in trace("span")}
+    assert {"index.load", "index.rebuild", "cache.lookup", "executor.acquire", "executor.script"} <= set(spans)
+    assert spans["executor.script"]["attrs"] == {"skill": "hello", "script": "hello.py"}
+    assert spans["executor.acquire"]["attrs"]["spawned"] is True
+    counters = [(r["name"], r["attrs"]) for r in trace("counter")]
+    assert counters == [("cache.miss", {}), ("executor.spawn", {}), ("cache.hit", {"tier": "memory"})]
+
+
+def test_retrieval_span(trace, tmp_path, make_skill):
+    pytest.importorskip("numpy")
+    make_skill("pdf", description="Extract text from PDF files.")
+    SkillRegistry(tmp_path, persist=False).select_skills("pdf", k=3)
+    assert [r["attrs"] for r in trace("span") if r["name"] == "retrieval.search"] == [{"k": 3}]
+
+
+def test_custom_exporters_implement_the_abstract_methods():
+    with pytest.raises(TypeError):
+        instrument.Exporter()
+    with pytest.raises(TypeError):
+        type("Partial", (instrument.SpanExporter,), {"count": lambda self, name, value, attrs: None})()
+
+    class Collect(instrument.SpanExporter):
+        def __init__(self):
+            self.spans, self.counts = [], []
+
+        def export_span(self, span):
+            self.spans.append(span.name)
+
+        def count(self, name, value, attrs):
+            self.counts.append(name)
+
+    exporter = Collect()
+    instrument.enable(exporter)
+    try:
+        with instrument.span("work"):
+            instrument.count("items")
+    finally:
+        instrument.disable()
+    assert (exporter.spans, exporter.counts) == (["work"], ["items"])
@@ -0,0 +1,150 @@
+import asyncio
+import gc
+import time
+
+import pytest
+
+from skills import Invocation, SkillRegistry
+
+SLEEP = """
+import sys, time
+time.sleep(float(sys.argv[1]))
+print(sys.argv[1])
+"""
+FAIL = "raise SystemExit(2)\n"
+
+
+@pytest.fixture
+def registry(tmp_path, make_skill):
+    make_skill("web", extra="resources: [network]\n", scripts={"sleep.py": SLEEP})
+    make_skill("local", scripts={"sleep.py": SLEEP, "fail.py": FAIL})
+    registry = SkillRegistry(tmp_path, persist=False)
+    yield registry
+    registry.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_independent_invocations_run_concurrently(registry):
+    registry.executor.warm(count=2)
+
+    async def main():
+        start = time.monotonic()
+        results = await registry.invoke_many(
+            [Invocation("local", "sleep.py", ["0.5"], id=f"s{i}") for i in range(2)]
+        )
+        return time.monotonic() - start, results
+
+    elapsed, results = run(main())
+    assert list(results) == ["s0", "s1"]
+    assert all(r.ok for r in results.values())
+    assert elapsed < 0.95
+
+
+def test_dependencies_order_and_feed_arguments(registry):
+    async def main():
+        return await registry.invoke_many([
+            Invocation("local", "sleep.py", lambda deps: [deps["first"].stdout.strip()], id="second",
+                       depends_on=["first"]),
+            Invocation("local", "sleep.py", ["0.05"], id="first"),
+        ])
+
+    results = run(main())
+    assert results["second"].ok
+    assert results["second"].args == ["0.05"]
+
+
+def test_failed_dependency_skips_dependents(registry):
+    async def main():
+        return await registry.invoke_many([
+            Invocation("local", "fail.py", id="bad"),
+            Invocation("local", "sleep.py", ["0"], id="child", depends_on=["bad"]),
+            Invocation("local", "sleep.py", ["0"], id="grandchild", depends_on=["child"]),
+        ])
+
+    results = run(main())
+    assert results["bad"].returncode == 2
+    assert results["child"].returncode is None
+    assert results["child"].error == "dependency 'bad' failed"
+    assert results["grandchild"].error == "dependency 'child' failed"
+
+
+@pytest.mark.parametrize(
+    "invocations, message",
+    [
+        ([Invocation("local", "sleep.py", id="a", depends_on=["b"]),
+          Invocation("local", "sleep.py", id="b", depends_on=["a"])], "cycle"),
+        ([Invocation("local", "sleep.py", id="a", depends_on=["a"])], "cycle"),
+        ([Invocation("local", "sleep.py", id="a", depends_on=["missing"])], "unknown"),
+        ([Invocation("local", "sleep.py"), Invocation("local", "sleep.py")], "duplicate"),
+    ],
+)
+def test_invalid_graphs_are_rejected_before_running(registry, invocations, message):
+    with pytest.raises(ValueError, match=message):
+        run(registry.invoke_many(invocations))
+    assert registry.executor.worker_count == 0
+
+
+def test_resource_limit_bounds_concurrency(registry):
+    registry.executor.warm(count=2)
+
+    async def main():
+        start = time.monotonic()
+        await registry.invoke_many(
+            [Invocation("web", "sleep.py", ["0.3"], id=f"w{i}") for i in range(2)],
+            resource_limits={"network": 1},
+        )
+        return time.monotonic() - start
+
+    assert run(main()) >= 0.6
+
+
+def test_error_does_not_block_the_event_loop(registry):
+    async def main():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        with pytest.raises(FileNotFoundError):
+            await registry.invoke_many([
+                Invocation("local", "sleep.py", ["3"], id="slow"),
+                Invocation("local", "missing.py", id="broken"),
+            ])
+        elapsed = time.monotonic() - start
+        await asyncio.sleep(0.2)
+        tick_task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = run(main())
+    assert elapsed < 1.0
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.5
+
+
+def test_cancellation_returns_promptly_without_unretrieved_exceptions(registry):
+    errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                registry.invoke_many([
+                    Invocation("local", "sleep.py", ["3"], id="slow"),
+                    Invocation("local", "sleep.py", ["0"], id="after", depends_on=["slow"]),
+                ]),
+                0.5,
+            )
+        elapsed = time.monotonic() - start
+        gc.collect()
+        await asyncio.sleep(0)
+        return elapsed
+
+    assert run(main()) < 1.5
+    assert errors == []
@@ -0,0 +1,104 @@
+import pytest
+
+from skills import parser
+from skills.parser import (
+    FrontmatterError,
+    iter_frontmatter,
+    iter_sections,
+    parse_frontmatter,
+    read_body,
+    read_frontmatter,
+    read_frontmatter_many,
+    split_frontmatter,
+)
+
+
+def write(tmp_path, content, name="SKILL.md"):
+    path = tmp_path / name
+    path.write_bytes(content if isinstance(content, bytes) else content.encode())
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 4096])
+def test_frontmatter_across_chunk_boundaries(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(parser, "CHUNK_SIZE", chunk_size)
+    path = write(tmp_path, "---\nname: pdf\ndescription: Extract text\n---\n# Body\n")
+    assert read_frontmatter(path) == {"name": "pdf", "description": "Extract text"}
+    assert read_body(path) == "# Body\n"
+
+
+def test_bom_crlf_and_body_offset():
+    data = "﻿---\r\nname: x\r\n---\r\nbody".encode()
+    text, offset = split_frontmatter(data)
+    assert text == "name: x\r\n"
+    assert data[offset:] == b"body"
+
+
+def test_closing_delimiter_at_end_of_file():
+    assert split_frontmatter(b"---\na: 1\n---") == ("a: 1\n", 12)
+
+
+def test_body_is_not_decoded(tmp_path):
+    path = write(tmp_path, b"---\nname: x\n---\n\xff\xfe not utf-8")
+    assert read_frontmatter(path) == {"name": "x"}
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ("name: x\n", "missing opening"),
+        ("---\nname: x\n", "missing closing"),
+        ("", "missing opening"),
+        ("---\n- a\n- b\n---\n", "must be a mapping"),
+    ],
+)
+def test_errors_name_the_file(tmp_path, content, message):
+    path = write(tmp_path, content)
+    with pytest.raises(FrontmatterError, match=message) as excinfo:
+        read_frontmatter(path)
+    assert path in str(excinfo.value)
+
+
+def test_oversized_frontmatter_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, "MAX_FRONTMATTER", 64)
+    monkeypatch.setattr(parser, "CHUNK_SIZE", 16)
+    path = write(tmp_path, "---\n" + "a: b\n" * 100 + "---\n")
+    with pytest.raises(FrontmatterError, match="exceeds"):
+        read_frontmatter(path)
+
+
+def test_flat_fallback_without_yaml(monkeypatch):
+    monkeypatch.setattr(parser, "yaml", None)
+    assert parse_frontmatter("name: 'x'\n# comment\ncacheable: true\ndescription: a: b\n") == {
+        "name": "x",
+        "cacheable": True,
+        "description": "a: b",
+    }
+    with pytest.raises(FrontmatterError, match="line 1"):
+        parse_frontmatter("not a pair", "f.md")
+
+
+def test_iter_sections_respects_code_fences(tmp_path):
+    path = write(
+        tmp_path,
+        "---\nname: x\n---\nintro\n# A\ntext a\n```\n# not a heading\n```\n## B ##\ntext b\n#hashtag\n",
+    )
+    sections = list(iter_sections(path))
+    assert [(s.heading, s.level) for s in sections] == [("", 0), ("A", 1), ("B", 2)]
+    assert "# not a heading" in sections[1].text
+    assert sections[2].text == "text b\n#hashtag\n"
+
+
+def test_iter_sections_without_preamble(tmp_path):
+    path = write(tmp_path, "---\nname: x\n---\n# Only\nbody\n")
+    assert [s.heading for s in iter_sections(path)] == ["Only"]
+
+
+def test_batch_parsing_keeps_order_and_reports_errors(tmp_path):
+    paths = [write(tmp_path, f"---\nname: s{i}\n---\n", f"s{i}.md") for i in range(20)]
+    paths.insert(5, str(tmp_path / "missing.md"))
+    results = read_frontmatter_many(paths, max_workers=4)
+    assert [r.path for r in results] == paths
+    assert not results[5].ok and isinstance(results[5].error, FileNotFoundError)
+    assert [r.frontmatter["name"] for r in results if r.ok] == [f"s{i}" for i in range(20)]
+    assert [r.path for r in iter_frontmatter(paths[:3], max_workers=1)] == paths[:3]
@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from skills import SkillMeta, SkillRegistry  # noqa: E402
+from skills.retrieval import SkillRetriever, tokenize  # noqa: E402
+
+
+def meta(name, description):
+    return SkillMeta(name=name, description=description, path=name)
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("Extract the TEXT from a PDF-file!") == ["extract", "text", "pdf", "file"]
+
+
+def test_search_ranks_by_relevance():
+    retriever = SkillRetriever([
+        meta("pdf", "Extract text and tables from PDF documents"),
+        meta("xlsx", "Read and write Excel spreadsheets"),
+        meta("web-fetch", "Download web pages"),
+    ])
+    assert [name for name, _ in retriever.search("pdf tables", 3)] == ["pdf"]
+    assert retriever.search("excel spreadsheets", 1)[0][0] == "xlsx"
+    assert retriever.search("web", 5)[0][0] == "web-fetch"  # matches the name too
+    assert retriever.search("unrelated words", 5) == []
+    assert retriever.search("pdf", 0) == []
+
+
+def test_scores_are_sorted_and_positive():
+    retriever = SkillRetriever([meta(f"s{i}", "chart " * (i + 1) + "data") for i in range(10)])
+    results = retriever.search("chart", 10)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(score > 0 for score in scores)
+
+
+def test_incremental_update_matches_full_rebuild():
+    metas = [meta(f"s{i}", f"alpha beta{i % 3} gamma{i}") for i in range(20)]
+    retriever = SkillRetriever(metas)
+    retriever.update(meta("s3", "delta delta alpha"))
+    retriever.remove("s7")
+    retriever.add(meta("new", "delta beta1"))
+
+    expected = [m for m in metas if m.name not in ("s3", "s7")]
+    expected += [meta("s3", "delta delta alpha"), meta("new", "delta beta1")]
+    fresh = SkillRetriever(expected)
+    for query in ("alpha", "delta", "beta1 gamma4", "gamma7"):
+        assert dict(retriever.search(query, 25)) == pytest.approx(dict(fresh.search(query, 25)))
+    assert len(retriever) == 20
+    assert "s7" not in retriever
+    assert retriever.remove("s7") is False
+
+
+def test_freed_slots_are_reused():
+    retriever = SkillRetriever([meta("a", "one"), meta("b", "two")])
+    retriever.remove("a")
+    retriever.add(meta("c", "three"))
+    assert len(retriever.scores("three")) == 2
+    assert retriever.search("three", 1)[0][0] == "c"
+
+
+def test_registry_select_skills_follows_refresh(tmp_path, make_skill):
+    make_skill("pdf", description="Extract PDF text")
+    make_skill("xlsx", description="Spreadsheets")
+    registry = SkillRegistry(tmp_path, persist=False)
+    assert [m.name for m in registry.select_skills("pdf")] == ["pdf"]
+
+    make_skill("xlsx", description="Spreadsheets exported to CSV")
+    make_skill("pdf", description="Merge documents together")
+    registry.refresh()
+    assert [m.name for m in registry.select_skills("csv")] == ["xlsx"]
+    assert [m.name for m in registry.select_skills("merge")] == ["pdf"]
+    assert registry.select_skills("extract") == []
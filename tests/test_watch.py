@@ -0,0 +1,159 @@
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import write_skill
+from skills import ResultCache, SkillRegistry
+from skills.executor import ExecutionResult
+from skills.watch import SkillWatcher
+
+BACKENDS = [
+    pytest.param(
+        "inotify",
+        marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only"),
+    ),
+    "polling",
+]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def root(tmp_path, make_skill):
+    make_skill("skills/a", name="alpha", description="First skill.", scripts={"run.py": "print(1)\n"})
+    make_skill("skills/b", name="beta", description="Second skill.")
+    return tmp_path / "skills"
+
+
+@pytest.fixture(params=BACKENDS)
+def watched(request, root):
+    registry = SkillRegistry(root, persist=False, cache=ResultCache())
+    changes = []
+    watcher = registry.watch(backend=request.param, poll_interval=0.05, debounce=0.05, on_change=changes.append)
+    assert watcher.backend == request.param
+    yield registry, changes
+    watcher.stop()
+
+
+def paths(registry):
+    return {meta.name: meta.path for meta in registry}
+
+
+def test_add_edit_delete(watched, root):
+    registry, changes = watched
+    write_skill(root, "group/c", name="gamma", description="Third skill.")
+    assert wait_for(lambda: "gamma" in registry)
+    assert registry.get("gamma").path == "group/c"
+
+    write_skill(root, "a", name="alpha", description="First skill, now with a longer description.")
+    assert wait_for(lambda: "longer" in registry.get("alpha").description)
+
+    shutil.rmtree(root / "b")
+    assert wait_for(lambda: "beta" not in registry)
+    assert paths(registry) == {"alpha": "a", "gamma": "group/c"}
+    assert {"gamma"} in changes and {"beta"} in changes
+
+
+def test_rename_and_move(watched, root):
+    registry, _ = watched
+    os.rename(root / "a", root / "a2")
+    assert wait_for(lambda: paths(registry).get("alpha") == "a2")
+    os.makedirs(root / "nested")
+    os.rename(root / "a2", root / "nested" / "a")
+    assert wait_for(lambda: paths(registry).get("alpha") == "nested/a")
+    assert paths(registry) == {"alpha": "nested/a", "beta": "b"}
+
+
+def test_rename_and_back_within_one_batch(watched, root):
+    registry, _ = watched
+    os.rename(root / "a", root / "a2")
+    os.rename(root / "a2", root / "a")
+    time.sleep(0.3)
+    assert paths(registry) == {"alpha": "a", "beta": "b"}
+
+
+def test_edit_drops_cached_results(watched, root):
+    registry, _ = watched
+    registry.cache.put("k" * 64, ExecutionResult("alpha", "run.py", [], returncode=0))
+    write_skill(root, "a", name="alpha", description="Edited description that is longer.")
+    assert wait_for(lambda: "alpha" not in registry.cache._tags)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_script_edit_invalidates_skill(root):
+    registry = SkillRegistry(root, persist=False, cache=ResultCache())
+    registry.cache.put("k" * 64, ExecutionResult("alpha", "run.py", [], returncode=0))
+    changes = []
+    with registry.watch(backend="inotify", debounce=0.05, on_change=changes.append):
+        loaded = registry.load("alpha")
+        with open(root / "a" / "scripts" / "run.py", "a") as fh:
+            fh.write("print(2)\n")
+        assert wait_for(lambda: {"alpha"} in changes)
+    assert "alpha" not in registry.cache._tags
+    assert registry.load("alpha") is not loaded
+
+
+@pytest.mark.parametrize("order", [("b", "a"), ("a", "b")])
+def test_update_paths_rename_is_order_independent(root, order):
+    registry = SkillRegistry(root, persist=False)
+    os.rename(root / "a", root / "b2")
+    os.rename(root / "b", root / "a")
+    os.rename(root / "b2", root / "b")
+    changed = registry.update_paths([root / name for name in order])
+    assert changed == {"alpha", "beta"}
+    assert paths(registry) == {"alpha": "b", "beta": "a"}
+
+
+def test_select_skills_sees_whole_batches(tmp_path):
+    pytest.importorskip("numpy")
+    root = tmp_path / "lib"
+    for i in range(40):
+        write_skill(root, f"batch/s{i}", name=f"old-{i}", description="zebra crossing")
+    registry = SkillRegistry(root, persist=False)
+    assert len(registry.select_skills("zebra", k=100)) == 40
+    seen, stop = [], threading.Event()
+
+    def search():
+        while not stop.is_set():
+            hits = registry.select_skills("zebra", k=100)
+            seen.append((len(hits), {m.name.split("-")[0] for m in hits}))
+
+    searcher = threading.Thread(target=search)
+    searcher.start()
+    try:
+        for round_ in range(6):
+            prefix = "new" if round_ % 2 == 0 else "old"
+            for i in range(40):
+                write_skill(root, f"batch/s{i}", name=f"{prefix}-{i}", description="zebra crossing " + "x" * round_)
+            registry.update_paths([root / "batch"])
+    finally:
+        stop.set()
+        searcher.join()
+    assert seen
+    for count, prefixes in seen:
+        assert count == 40 and len(prefixes) == 1, (count, prefixes)
+
+
+def test_changes_in_shadowed_skills_are_not_dropped(root):
+    write_skill(root, "z/alpha", name="alpha", description="Shadowed copy.", scripts={"run.py": "print(2)\n"})
+    registry = SkillRegistry(root, persist=False)
+    assert registry.get("alpha").path == "a"
+    assert sorted(registry.snapshot().paths()) == ["a", "b", "z/alpha"]
+    watcher = SkillWatcher(registry, backend="polling")
+    script = str(root / "z" / "alpha" / "scripts" / "run.py")
+    assert watcher._affected([script]) == {str(root / "z" / "alpha")}
+
+    shutil.rmtree(root / "a")
+    registry.update_paths(watcher._affected([str(root / "a" / "scripts" / "run.py")]))
+    assert registry.get("alpha").path == "z/alpha"